@@ -1,14 +1,22 @@
 """SoundForge Streamlit App - Generate game SFX from text prompts."""
 
+import re
+import uuid
 import streamlit as st
-import json
+import orjson
+from concurrent.futures import CancelledError, Future, ThreadPoolExecutor
 from soundforge import (
     SoundSpec,
     generate_soundspec,
+    generate_soundspec_batch,
     render_wav_bytes,
+    render_wav_bytes_cached,
     update_spec_from_param,
-    get_default_pickup
+    get_default_pickup,
+    get_all_presets
 )
+from soundforge.history import HistoryStore
+from soundforge.semantic_cache import default_cache_dir
 
 st.set_page_config(
     page_title="SoundForge",
@@ -16,34 +24,216 @@ st.set_page_config(
     layout="wide"
 )
 
+
+# Random per-browser id carried in the page URL
+_CLIENT_ID_RE = re.compile(r"[0-9a-f]{32}")
+
+
+def get_client_id() -> str:
+    """
+    Stable id for this browser, kept as the ?client= query parameter.
+    
+    The id survives page reloads and bookmarks without needing cookies.
+    Anyone given the URL shares its history.
+    """
+    if 'client_id' not in st.session_state:
+        client_id = st.query_params.get("client", "")
+        if not _CLIENT_ID_RE.fullmatch(client_id):
+            client_id = uuid.uuid4().hex
+        st.session_state.client_id = client_id
+    if st.query_params.get("client") != st.session_state.client_id:
+        st.query_params["client"] = st.session_state.client_id
+    return st.session_state.client_id
+
+
+@st.cache_resource(max_entries=256)
+def open_history_store(client_id: str) -> HistoryStore:
+    """On-disk history for one client, opened on first use."""
+    return HistoryStore(default_cache_dir() / "histories" / client_id)
+
+
+def get_history_store() -> HistoryStore:
+    """History for this browser; other visitors never see its entries."""
+    return open_history_store(get_client_id())
+
+
+# History holds compressed entries, so a long list stays cheap
+HISTORY_SIZE = 100
+# Seconds between checks on a render still running in the background
+RENDER_POLL_SECONDS = 0.25
+
 # Initialize session state
 if 'current_spec' not in st.session_state:
     st.session_state.current_spec = None
 if 'current_wav' not in st.session_state:
     st.session_state.current_wav = None
+if 'render_future' not in st.session_state:
+    st.session_state.render_future = None
 if 'history' not in st.session_state:
-    st.session_state.history = []
+    st.session_state.history = get_history_store().recent(HISTORY_SIZE)
 if 'auto_render' not in st.session_state:
     st.session_state.auto_render = False
+if 'variations' not in st.session_state:
+    st.session_state.variations = []
+if 'applied_params' not in st.session_state:
+    st.session_state.applied_params = (None, {})
+if 'spec_dump_cache' not in st.session_state:
+    st.session_state.spec_dump_cache = (None, -1, None, None)
+
+
+@st.cache_resource
+def get_preset_renders() -> dict[str, Future]:
+    """Start rendering every preset in the background, keyed by spec JSON."""
+    pool = ThreadPoolExecutor(max_workers=4)
+    renders = {
+        spec.model_dump_json(by_alias=True): pool.submit(render_wav_bytes, spec)
+        for spec in get_all_presets().values()
+    }
+    # Workers exit once the queued renders finish
+    pool.shutdown(wait=False)
+    return renders
+
+
+@st.cache_resource
+def get_render_pool() -> ThreadPoolExecutor:
+    """Worker threads shared by all sessions for on-demand renders."""
+    return ThreadPoolExecutor(max_workers=4)
+
+
+def render_spec_json(spec_json: str) -> bytes:
+    """Render SoundSpec JSON to WAV, memoized on the JSON text."""
+    return render_wav_bytes_cached(SoundSpec.model_validate_json(spec_json))
+
+
+def get_spec_json(spec: SoundSpec) -> tuple[dict, str]:
+    """
+    Dump a spec to JSON data and indented text.
+    
+    Both are reused until the spec is edited.
+    """
+    cached_spec, revision, spec_json, spec_text = st.session_state.spec_dump_cache
+    if cached_spec is not spec or revision != spec.revision:
+        spec_json = spec.model_dump(by_alias=True, mode='json')
+        spec_text = orjson.dumps(spec_json, option=orjson.OPT_INDENT_2).decode()
+        st.session_state.spec_dump_cache = (spec, spec.revision, spec_json, spec_text)
+    return spec_json, spec_text
 
 
 def render_current_spec():
-    """Render the current spec to WAV."""
+    """
+    Start rendering the current spec without waiting for it.
+    
+    Preset renders already in flight are reused. The result is picked up
+    by collect_render() on a later run.
+    """
     if st.session_state.current_spec:
-        try:
-            st.session_state.current_wav = render_wav_bytes(st.session_state.current_spec)
-        except Exception as e:
-            st.error(f"Rendering error: {e}")
-            st.session_state.current_wav = None
+        # The JSON snapshot is the cache key for both kinds of reuse
+        spec_json = st.session_state.current_spec.model_dump_json(by_alias=True)
+        future = get_preset_renders().get(spec_json)
+        if future is None:
+            future = get_render_pool().submit(render_spec_json, spec_json)
+        previous = st.session_state.render_future
+        if previous is not None and previous is not future and previous not in get_preset_renders().values():
+            # A newer edit supersedes it; drop it if it has not started yet
+            previous.cancel()
+        st.session_state.render_future = future
+
+
+def collect_render() -> bool:
+    """
+    Make a finished background render the current WAV.
+    
+    Returns True while the latest render is still running.
+    """
+    future = st.session_state.render_future
+    if future is None:
+        return False
+    if not future.done():
+        return True
+    st.session_state.render_future = None
+    try:
+        st.session_state.current_wav = future.result()
+    except CancelledError:
+        pass
+    except Exception as e:
+        st.error(f"Rendering error: {e}")
+        st.session_state.current_wav = None
+    return False
+
+
+def render_player(polling: bool):
+    """
+    Audio player and WAV download for the current spec.
+    
+    While a render runs this fragment polls on a timer instead of blocking.
+    """
+    if polling:
+        if collect_render():
+            st.info("⏳ Rendering...")
+            return
+        # Finished: rerun the app so the player is drawn without the timer
+        st.rerun()
+    
+    if st.session_state.current_wav:
+        st.audio(st.session_state.current_wav, format="audio/wav")
+        st.download_button(
+            "💾 Download WAV",
+            data=st.session_state.current_wav,
+            file_name=f"{st.session_state.current_spec.name}.wav",
+            mime="audio/wav"
+        )
+    else:
+        st.info("Click 'Render/Update' to generate audio")
+
+
+def apply_param(spec: SoundSpec, param, value):
+    """Write a widget value into the spec, skipping values already applied."""
+    applied_spec, applied = st.session_state.applied_params
+    if applied_spec is not spec:
+        applied = {}
+        st.session_state.applied_params = (spec, applied)
+    if param.id in applied and applied[param.id] == value:
+        return
+    applied[param.id] = value
+    if update_spec_from_param(spec, param.path, value):
+        if st.session_state.auto_render:
+            render_current_spec()
 
 
 def add_to_history(spec: SoundSpec):
-    """Add a spec to history."""
-    st.session_state.history.insert(0, spec)
-    if len(st.session_state.history) > 10:
+    """Add a spec to history and persist it for later sessions."""
+    entry = get_history_store().add(spec)
+    st.session_state.history.insert(0, entry)
+    if len(st.session_state.history) > HISTORY_SIZE:
         st.session_state.history.pop()
 
 
+def load_spec(spec: SoundSpec):
+    """Button callback: make spec current and queue a render."""
+    st.session_state.current_spec = spec
+    render_current_spec()
+
+
+def load_default_pickup():
+    """Button callback: load the default pickup preset."""
+    load_spec(get_default_pickup())
+
+
+def load_history_entry(entry):
+    """Button callback: load a fresh copy of a history entry's spec."""
+    load_spec(entry.load())
+
+
+def use_variation(index: int):
+    """Button callback: make a generated variation current and remember it."""
+    spec = st.session_state.variations[index][0].model_copy(deep=True)
+    add_to_history(spec)
+    load_spec(spec)
+
+
+# Kick off preset rendering on first load so presets play without waiting
+get_preset_renders()
+
 # Header
 st.title("🔊 SoundForge")
 st.markdown("Generate game sound effects from natural language prompts using safe, structured JSON.")
@@ -52,18 +242,6 @@ st.markdown("Generate game sound effects from natural language prompts using saf
 with st.sidebar:
     st.header("Settings")
     st.session_state.auto_render = st.checkbox("Auto-render on parameter change", value=st.session_state.auto_render)
-    
-    st.divider()
-    st.header("History")
-    
-    if st.session_state.history:
-        for i, spec in enumerate(st.session_state.history):
-            if st.button(f"{i+1}. {spec.name}", key=f"history_{i}"):
-                st.session_state.current_spec = spec
-                render_current_spec()
-                st.rerun()
-    else:
-        st.info("No history yet")
 
 # Main content
 col1, col2 = st.columns([2, 1])
@@ -94,17 +272,29 @@ with col1:
                     add_to_history(spec)
                     render_current_spec()
                     st.success(f"Generated: {spec.name}")
-                    st.rerun()
+                except Exception as e:
+                    st.error(f"Generation error: {e}")
+        else:
+            st.warning("Please enter a prompt")
+    
+    # Variations button
+    if st.button("🎲 Generate 4 Variations", use_container_width=True):
+        if prompt:
+            with st.spinner("Generating variations..."):
+                try:
+                    specs = generate_soundspec_batch(prompt, style if style else None, n=4)
+                    # One worker per variation; the render kernels release the GIL.
+                    # Plain render_wav_bytes, since st.cache_data needs the script thread
+                    with ThreadPoolExecutor(max_workers=max(1, len(specs))) as pool:
+                        wavs = list(pool.map(render_wav_bytes, specs))
+                    st.session_state.variations = list(zip(specs, wavs))
                 except Exception as e:
                     st.error(f"Generation error: {e}")
         else:
             st.warning("Please enter a prompt")
     
     # Load default button
-    if st.button("Load Default Pickup"):
-        st.session_state.current_spec = get_default_pickup()
-        render_current_spec()
-        st.rerun()
+    st.button("Load Default Pickup", on_click=load_default_pickup)
 
 with col2:
     st.header("Quick Info")
@@ -117,97 +307,124 @@ with col2:
     else:
         st.info("Generate or load a sound to see details")
 
-# Dynamic parameters
-if st.session_state.current_spec and st.session_state.current_spec.params:
+# Variations
+if st.session_state.variations:
     st.divider()
-    st.header("🎛️ Tweak Parameters")
-    
-    spec = st.session_state.current_spec
-    param_cols = st.columns(min(3, len(spec.params)))
+    st.header("🎲 Variations")
     
-    for i, param in enumerate(spec.params):
-        col_idx = i % len(param_cols)
-        with param_cols[col_idx]:
-            if param.kind == "slider":
-                value = st.slider(
-                    param.label,
-                    min_value=param.min,
-                    max_value=param.max,
-                    value=param.default if param.default is not None else param.min,
-                    step=param.step,
-                    key=f"param_{param.id}"
-                )
-                if update_spec_from_param(spec, param.path, value):
-                    if st.session_state.auto_render:
-                        render_current_spec()
-            
-            elif param.kind == "select":
-                value = st.selectbox(
-                    param.label,
-                    options=param.options,
-                    index=param.options.index(param.default) if param.default in param.options else 0,
-                    key=f"param_{param.id}"
-                )
-                if update_spec_from_param(spec, param.path, value):
-                    if st.session_state.auto_render:
-                        render_current_spec()
+    variation_cols = st.columns(len(st.session_state.variations))
+    for i, (spec, wav) in enumerate(st.session_state.variations):
+        with variation_cols[i]:
+            st.markdown(f"**{spec.name}**  \n{spec.description}")
+            st.audio(wav, format="audio/wav")
+            st.button(
+                "Use this",
+                key=f"variation_{i}",
+                on_click=use_variation,
+                args=(i,),
+                use_container_width=True
+            )
+
+@st.fragment
+def tweak_and_play():
+    """Parameter controls and player; widget changes rerun only this fragment."""
+    # Dynamic parameters
+    if st.session_state.current_spec and st.session_state.current_spec.params:
+        st.divider()
+        st.header("🎛️ Tweak Parameters")
+        
+        spec = st.session_state.current_spec
+        param_cols = st.columns(min(3, len(spec.params)))
+        
+        for i, param in enumerate(spec.params):
+            col_idx = i % len(param_cols)
+            with param_cols[col_idx]:
+                if param.kind == "slider":
+                    value = st.slider(
+                        param.label,
+                        min_value=param.min,
+                        max_value=param.max,
+                        value=param.default if param.default is not None else param.min,
+                        step=param.step,
+                        key=f"param_{param.id}"
+                    )
+                    apply_param(spec, param, value)
+                
+                elif param.kind == "select":
+                    value = st.selectbox(
+                        param.label,
+                        options=param.options,
+                        index=param.options.index(param.default) if param.default in param.options else 0,
+                        key=f"param_{param.id}"
+                    )
+                    apply_param(spec, param, value)
+                
+                elif param.kind == "checkbox":
+                    value = st.checkbox(
+                        param.label,
+                        value=param.default if param.default is not None else False,
+                        key=f"param_{param.id}"
+                    )
+                    apply_param(spec, param, value)
+
+    # Render/Play section
+    if st.session_state.current_spec:
+        st.divider()
+        st.header("🎵 Render & Play")
+        
+        col1, _ = st.columns([1, 3])
+        
+        with col1:
+            if st.button("🔄 Render/Update", use_container_width=True):
+                render_current_spec()
+        
+        # Audio player; only polls while a render is pending
+        pending = collect_render()
+        st.fragment(render_player, run_every=RENDER_POLL_SECONDS if pending else None)(pending)
+        
+        # Expandable sections
+        with st.expander("📄 View SoundSpec JSON"):
+            spec_json, spec_text = get_spec_json(st.session_state.current_spec)
+            st.json(spec_json)
             
-            elif param.kind == "checkbox":
-                value = st.checkbox(
-                    param.label,
-                    value=param.default if param.default is not None else False,
-                    key=f"param_{param.id}"
+            st.download_button(
+                "💾 Download JSON",
+                data=spec_text,
+                file_name=f"{st.session_state.current_spec.name}.json",
+                mime="application/json"
+            )
+        
+        with st.expander("🔍 Layer Details"):
+            # One markdown element instead of four per layer
+            lines = []
+            for layer in st.session_state.current_spec.layers:
+                lines.append(
+                    f"### Layer: {layer.id}\n"
+                    f"- Type: {layer.type}\n"
+                    f"- Amplitude: {layer.amp}\n"
+                    f"- Envelope: attack={layer.env.attack}s, decay={layer.env.decay}s, shape={layer.env.shape}\n"
                 )
-                if update_spec_from_param(spec, param.path, value):
-                    if st.session_state.auto_render:
-                        render_current_spec()
+            st.markdown("\n".join(lines))
+
+
+tweak_and_play()
 
-# Render/Play section
-if st.session_state.current_spec:
+# Sidebar history, drawn last so entries added during this run are listed
+with st.sidebar:
     st.divider()
-    st.header("🎵 Render & Play")
-    
-    col1, col2, col3 = st.columns([1, 1, 2])
-    
-    with col1:
-        if st.button("🔄 Render/Update", use_container_width=True):
-            render_current_spec()
-            st.rerun()
+    st.header("History")
     
-    with col2:
-        if st.session_state.current_wav:
-            st.download_button(
-                "💾 Download WAV",
-                data=st.session_state.current_wav,
-                file_name=f"{st.session_state.current_spec.name}.wav",
-                mime="audio/wav",
-                use_container_width=True
+    if st.session_state.history:
+        for i, entry in enumerate(st.session_state.history):
+            layers = "layer" if entry.num_layers == 1 else "layers"
+            st.button(
+                f"{i+1}. {entry.name} ({entry.duration:.2f}s, {entry.num_layers} {layers})",
+                key=f"history_{i}",
+                on_click=load_history_entry,
+                args=(entry,)
             )
-    
-    # Audio player
-    if st.session_state.current_wav:
-        st.audio(st.session_state.current_wav, format="audio/wav")
     else:
-        st.info("Click 'Render/Update' to generate audio")
-    
-    # Expandable sections
-    with st.expander("📄 View SoundSpec JSON"):
-        spec_json = st.session_state.current_spec.model_dump(by_alias=True, mode='json')
-        st.json(spec_json)
-        
-        st.download_button(
-            "💾 Download JSON",
-            data=json.dumps(spec_json, indent=2),
-            file_name=f"{st.session_state.current_spec.name}.json",
-            mime="application/json"
-        )
-    
-    with st.expander("🔍 Layer Details"):
-        for layer in st.session_state.current_spec.layers:
-            st.subheader(f"Layer: {layer.id}")
-            st.write(f"Type: {layer.type}")
-            st.write(f"Amplitude: {layer.amp}")
-            st.write(f"Envelope: attack={layer.env.attack}s, decay={layer.env.decay}s, shape={layer.env.shape}")
+        st.info("No history yet")
 
 # Footer
 st.divider()
@@ -1,8 +1,8 @@
 """SoundForge - Safe game SFX generation using structured JSON."""
 
 from soundforge.schema import SoundSpec, export_json_schema
-from soundforge.renderer import render_wav_bytes, render_samples
-from soundforge.llm import generate_soundspec
+from soundforge.renderer import render_wav_bytes, render_wav_bytes_cached, render_wav_chunks, render_samples
+from soundforge.llm import generate_soundspec, generate_soundspec_batch, generate_soundspec_many
 from soundforge.presets import get_default_pickup, get_all_presets
 from soundforge.paths import update_spec_from_param
 
@@ -12,8 +12,12 @@ __all__ = [
     "SoundSpec",
     "export_json_schema",
     "render_wav_bytes",
+    "render_wav_bytes_cached",
+    "render_wav_chunks",
     "render_samples",
     "generate_soundspec",
+    "generate_soundspec_batch",
+    "generate_soundspec_many",
     "get_default_pickup",
     "get_all_presets",
     "update_spec_from_param",
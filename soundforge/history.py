@@ -0,0 +1,76 @@
+"""Persistent SoundSpec history shared across app sessions."""
+
+import dbm
+import time
+import zlib
+import shelve
+import threading
+from pathlib import Path
+from typing import List, NamedTuple, Optional
+from soundforge.schema import SoundSpec
+
+
+class HistoryEntry(NamedTuple):
+    """A compressed SoundSpec plus the summary shown in history lists."""
+    name: str
+    duration: float
+    num_layers: int
+    blob: bytes
+
+    @classmethod
+    def from_spec(cls, spec: SoundSpec) -> "HistoryEntry":
+        blob = zlib.compress(spec.model_dump_json(by_alias=True).encode())
+        return cls(spec.name, spec.duration, len(spec.layers), blob)
+
+    def load(self) -> SoundSpec:
+        """Decompress a fresh copy of the spec."""
+        return SoundSpec.model_validate_json(zlib.decompress(self.blob))
+
+
+class HistoryStore:
+    """
+    Keeps the most recent SoundSpecs in a shelve database as HistoryEntry.
+
+    Keys are zero-padded insertion timestamps, so sorting keys gives insertion
+    order. Without a path, or if the database cannot be opened, history is
+    kept in memory only.
+    """
+
+    def __init__(self, path: Optional[Path] = None, max_entries: int = 100):
+        self.path = Path(path) if path is not None else None
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        if self.path is None:
+            self._db = {}
+            return
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._db = shelve.open(str(self.path))
+        except (OSError, dbm.error):
+            self._db = {}
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._db)
+
+    def add(self, spec: SoundSpec) -> HistoryEntry:
+        """Store a spec, dropping the oldest entries beyond max_entries."""
+        entry = HistoryEntry.from_spec(spec)
+        with self._lock:
+            self._db[f"{time.time_ns():020d}"] = entry
+            for key in sorted(self._db)[:-self.max_entries]:
+                del self._db[key]
+            if hasattr(self._db, "sync"):
+                self._db.sync()
+        return entry
+
+    def recent(self, limit: int = 10) -> List[HistoryEntry]:
+        """Get the most recently added entries, newest first."""
+        with self._lock:
+            keys = sorted(self._db, reverse=True)[:limit]
+            return [self._db[key] for key in keys]
+
+    def close(self) -> None:
+        with self._lock:
+            if hasattr(self._db, "close"):
+                self._db.close()
@@ -1,19 +1,62 @@
 """LLM integration for generating SoundSpec from prompts."""
 
 import os
-import json
-from typing import Optional
-from soundforge.schema import SoundSpec
-from soundforge.presets import get_default_pickup
+import re
+import hashlib
+import logging
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional
+from soundforge.schema import Layer, Param, SoundSpec
+from soundforge.presets import get_default_pickup, load_builtin_spec
+from soundforge.llm_cache import ExactCache, prompt_key
+from soundforge.semantic_cache import SemanticCache, DEFAULT_THRESHOLD, default_cache_dir
 
-try:
-    from dotenv import load_dotenv
-    load_dotenv()
-except ImportError:
-    pass
+logger = logging.getLogger(__name__)
+
+# Mock generator keyword -> bundled spec name; earlier specs win on ties
+_MOCK_KEYWORDS = {
+    "laser": "laser_blast",
+    "explosion": "explosion",
+    "boom": "explosion",
+    "shield": "shield_deflect",
+    "deflect": "shield_deflect",
+}
+_MOCK_PRIORITY = ("laser_blast", "explosion", "shield_deflect")
+
+_PURE_TONE_PHRASES = frozenset({
+    "pure tone",
+    "single tone",
+    "test tone",
+    "single beep",
+    "calibration tone",
+})
+
+# Every keyword any prompt heuristic looks for, matched as substrings in one
+# scan; longest first so a phrase wins over a keyword it contains
+_PROMPT_KEYWORDS = _PURE_TONE_PHRASES | set(_MOCK_KEYWORDS) | {
+    "blast", "plink", "pickup", "collect", "sparkle", "diamond",
+}
+_PROMPT_KEYWORD_RE = re.compile(
+    "|".join(map(re.escape, sorted(_PROMPT_KEYWORDS, key=len, reverse=True)))
+)
+
+# SoundSpec.params max_length, read from the schema so the two cannot drift
+_MAX_PARAMS = next(
+    constraint.max_length
+    for constraint in SoundSpec.model_fields["params"].metadata
+    if hasattr(constraint, "max_length")
+)
+
+_SPEC_VERSION = SoundSpec.model_fields["version"].default
+_VERSION_RE = re.compile(r'"version"\s*:\s*"([^"]*)"')
 
+# Cleared if the API rejects strict json_schema output for this model
+_strict_schema_supported = True
 
-SYSTEM_PROMPT = """You are a sound design AI. Output ONLY valid JSON matching this EXACT schema:
+# Keep the system prompt byte-identical across calls (no f-strings or
+# per-request hints) so the provider can cache it; style goes in the user message.
+_SCHEMA_PROMPT = """You are a sound design AI. Output ONLY valid JSON matching this EXACT schema:
 
 {
   "version": "soundspec-1",
@@ -56,9 +99,9 @@ CRITICAL: Match layer type to its params:
 - type "chirp" → "chirp": {"waveform": "saw", "f_start": 1000.0, "f_end": 200.0, "curve": "exponential", "vibrato_hz": 0.0, "vibrato_depth": 0.0}
 - type "fm" → "fm": {"carrier_freq": 440.0, "mod_freq": 220.0, "index": 5.0, "brightness": 0.5}
 - type "noise" → "noise": {"color": "white"}
-- type "impulse" → "impulse": {"kind": "click", "width": 0.005}
+- type "impulse" → "impulse": {"kind": "click", "width": 0.005}"""
 
-Layering rules:
+_GUIDANCE_PROMPT = """Layering rules:
 - Default to 2–4 layers for most prompts. Single-layer output is ONLY allowed for explicitly "pure tone", "single tone", or "test tone" requests.
 - Use complementary layer types to build texture (osc/chirp + noise/impulse/fm).
 - If using any "osc" layer, add 1–3 harmonics unless the user asks for a pure tone.
@@ -73,6 +116,25 @@ Adjective → layer hints (use as guidance):
 ALL layers MUST have: id, type, amp, pan, phase, env
 Output ONLY the JSON."""
 
+# Used with strict json_schema output: the API enforces the structure, so the
+# prompt only carries sound design guidance.
+SYSTEM_PROMPT = (
+    "You are a sound design AI. Output a SoundSpec for the user's sound. "
+    "Each layer fills only the params object matching its type and sets the others to null.\n\n"
+    + _GUIDANCE_PROMPT
+)
+
+# Fallback for plain json_object output, which needs the schema spelled out
+JSON_MODE_SYSTEM_PROMPT = _SCHEMA_PROMPT + "\n\n" + _GUIDANCE_PROMPT
+
+# Routes requests to the same provider cache shard so the static prefix
+# (system prompt plus response schema, well over the 1024-token caching
+# threshold) is served from OpenAI's prompt cache on repeat calls. Derived
+# from the prompts so any edit moves to a fresh shard.
+PROMPT_CACHE_KEY = "soundforge-" + hashlib.sha256(
+    (SYSTEM_PROMPT + JSON_MODE_SYSTEM_PROMPT).encode()
+).hexdigest()[:12]
+
 
 def generate_soundspec(prompt: str, style: Optional[str] = None) -> SoundSpec:
     """
@@ -85,87 +147,354 @@ def generate_soundspec(prompt: str, style: Optional[str] = None) -> SoundSpec:
     Returns:
         A validated SoundSpec object
     """
-    api_key = os.environ.get('OPENAI_API_KEY')
+    api_key = _api_key()
     
     if not api_key:
-        print("Warning: OPENAI_API_KEY not set, using mock generator")
+        logger.warning("OPENAI_API_KEY not set, using mock generator")
         return _mock_generator(prompt, style)
     
     try:
-        from openai import OpenAI
-        client = OpenAI(api_key=api_key)
-        
-        user_prompt = prompt
-        if style:
-            user_prompt = f"Style: {style}\n{prompt}"
-        
-        response = client.chat.completions.create(
-            model="gpt-4o-mini",
-            messages=[
-                {"role": "system", "content": SYSTEM_PROMPT},
-                {"role": "user", "content": user_prompt}
-            ],
-            temperature=0.7,
-            max_tokens=2000,
-            response_format={"type": "json_object"}
-        )
-        
-        content = response.choices[0].message.content.strip()
-        
-        # Remove markdown code blocks if present
-        if content.startswith('```'):
-            lines = content.split('\n')
-            content = '\n'.join(lines[1:-1]) if len(lines) > 2 else content
-            if content.startswith('json'):
-                content = content[4:].strip()
-        
-        # Parse and validate
-        spec_dict = json.loads(content)
-        
-        # Debug: print the received JSON
-        print(f"Received JSON keys: {spec_dict.keys()}")
-        if 'layers' in spec_dict and spec_dict['layers']:
-            print(f"First layer type: {spec_dict['layers'][0].get('type')}")
-            print(f"First layer keys: {spec_dict['layers'][0].keys()}")
-        
-        spec = SoundSpec.model_validate(spec_dict)
-        return _ensure_rich_layers(spec, prompt)
-        
+        normalized = prompt.strip().lower()
+        key = prompt_key(SYSTEM_PROMPT, style, normalized)
+        exact_cache = _get_exact_cache()
+        semantic_cache = _get_semantic_cache()
+        spec_json = exact_cache.get(key)
+        if spec_json is None:
+            spec_json = semantic_cache.lookup(prompt, style)
+            if spec_json is None:
+                # Normalized text only keys the caches; the model sees the prompt as typed
+                spec_json = _request_spec_jsons(prompt, style, 1)[0]
+                exact_cache.put(key, spec_json)
+                semantic_cache.add(prompt, style, spec_json)
+            else:
+                logger.info("Semantic cache hit for prompt %r", prompt)
+        # Fresh object per call so callers can mutate it via update_spec_from_param
+        return SoundSpec.model_validate_json(spec_json)
     except Exception as e:
-        print(f"Error generating SoundSpec: {e}")
+        logger.warning("Error generating SoundSpec: %s", e)
         return _mock_generator(prompt, style)
 
 
-def _mock_generator(prompt: str, style: Optional[str]) -> SoundSpec:
-    """Fallback mock generator when OpenAI API is unavailable."""
-    # Return a reasonable default based on keywords
-    prompt_lower = prompt.lower()
+def generate_soundspec_batch(prompt: str, style: Optional[str] = None, n: int = 4) -> List[SoundSpec]:
+    """
+    Generate several SoundSpec variations of one prompt.
+    
+    All variations come from a single OpenAI request (using the n parameter),
+    so the prompt is only processed once. Results are not cached, as each call
+    should produce fresh variations.
+    
+    Args:
+        prompt: User's description of the desired sound
+        style: Optional style hint (pickup, laser, explosion, etc.)
+        n: Number of variations to request
+    
+    Returns:
+        A list of validated SoundSpec objects (fewer than n if some
+        variations were invalid)
+    """
+    api_key = _api_key()
+    
+    if not api_key:
+        logger.warning("OPENAI_API_KEY not set, using mock generator")
+        return _mock_variations(prompt, style, n)
+    
+    try:
+        return [
+            SoundSpec.model_validate_json(spec_json)
+            for spec_json in _request_spec_jsons(prompt, style, n)
+        ]
+    except Exception as e:
+        logger.warning("Error generating SoundSpec variations: %s", e)
+        return _mock_variations(prompt, style, n)
+
+
+def generate_soundspec_many(
+    prompts: List[str], style: Optional[str] = None, max_workers: int = 8
+) -> List[SoundSpec]:
+    """
+    Generate SoundSpecs for several prompts concurrently.
+    
+    Requests run on a thread pool sharing one OpenAI client, so the batch takes
+    about as long as the slowest request rather than the sum of all of them.
+    Prompts that normalize to the same text are only requested once.
+    
+    Args:
+        prompts: User descriptions of the desired sounds
+        style: Optional style hint applied to every prompt
+        max_workers: Maximum number of requests in flight
+    
+    Returns:
+        One validated SoundSpec per prompt, in order
+    """
+    unique = {}
+    for prompt in prompts:
+        unique.setdefault(prompt.strip().lower(), prompt)
+    if not unique:
+        return []
+    
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(unique))) as pool:
+        futures = {
+            key: pool.submit(generate_soundspec, prompt, style)
+            for key, prompt in unique.items()
+        }
+        results = {key: future.result() for key, future in futures.items()}
+    
+    # Duplicates get their own copy so callers can edit them independently
+    specs = []
+    seen = set()
+    for prompt in prompts:
+        key = prompt.strip().lower()
+        spec = results[key]
+        specs.append(spec.model_copy(deep=True) if key in seen else spec)
+        seen.add(key)
+    return specs
+
+
+@functools.lru_cache(maxsize=1)
+def _load_dotenv() -> None:
+    """Load .env on first use of the API rather than at import time."""
+    try:
+        from dotenv import load_dotenv
+    except ImportError:
+        return
+    load_dotenv()
+
+
+def _api_key() -> Optional[str]:
+    _load_dotenv()
+    return os.environ.get('OPENAI_API_KEY')
+
+
+@functools.lru_cache(maxsize=1)
+def _get_client():
+    """
+    Get the shared OpenAI client, keeping its connection pool warm across calls.
+    
+    openai is imported here so the mock and preset paths never load it. The
+    client is thread-safe and retries rate-limit (429) responses with
+    exponential backoff.
+    """
+    from openai import OpenAI
+    return OpenAI(
+        api_key=os.environ['OPENAI_API_KEY'],
+        timeout=30.0,
+        max_retries=3,
+    )
+
+
+@functools.lru_cache(maxsize=1)
+def _get_exact_cache() -> ExactCache:
+    """Get the shared, disk-backed exact prompt cache."""
+    return ExactCache(path=default_cache_dir() / "specs.sqlite3")
+
+
+@functools.lru_cache(maxsize=1)
+def _get_semantic_cache() -> SemanticCache:
+    """Get the shared, disk-backed semantic prompt cache."""
+    threshold = float(os.environ.get('SOUNDFORGE_SEMANTIC_THRESHOLD', DEFAULT_THRESHOLD))
+    return SemanticCache(path=default_cache_dir() / "semantic", threshold=threshold)
+
+
+def _request_spec_jsons(prompt: str, style: Optional[str], n: int) -> List[str]:
+    """
+    Request n SoundSpecs from OpenAI in one completion.
+    
+    The prompt prefix is processed once for all n choices. Output is
+    constrained to the SoundSpec JSON schema, falling back to json_object mode
+    if the model rejects strict schemas. Returns the JSON of every choice that
+    validates; raises the first error if none do.
+    """
+    global _strict_schema_supported
     
-    if 'laser' in prompt_lower:
-        return _create_laser_spec()
-    elif 'explosion' in prompt_lower or 'boom' in prompt_lower:
-        return _create_explosion_spec()
-    elif 'shield' in prompt_lower or 'deflect' in prompt_lower:
-        return _create_shield_spec()
-    else:
-        # Default to gentle pickup
-        return get_default_pickup()
-
-
-def _is_pure_tone_prompt(prompt: str) -> bool:
-    prompt_lower = prompt.lower()
-    return any(
-        phrase in prompt_lower
-        for phrase in (
-            "pure tone",
-            "single tone",
-            "test tone",
-            "single beep",
-            "calibration tone",
+    stream = None
+    if _strict_schema_supported:
+        try:
+            stream = _create_completion(_build_messages(SYSTEM_PROMPT, style, prompt), n, {
+                "type": "json_schema",
+                "json_schema": {
+                    "name": "SoundSpec",
+                    "schema": _response_schema(),
+                    "strict": True,
+                },
+            })
+        except Exception as e:
+            if getattr(e, "status_code", None) != 400:
+                raise
+            logger.warning("Strict JSON schema rejected, using json_object mode: %s", e)
+            _strict_schema_supported = False
+    if stream is None:
+        stream = _create_completion(
+            _build_messages(JSON_MODE_SYSTEM_PROMPT, style, prompt), n, {"type": "json_object"}
         )
+    
+    spec_jsons = []
+    errors = []
+    for content in _read_stream(stream, n):
+        try:
+            spec_jsons.append(_parse_spec_json(content, prompt))
+        except ValueError as e:
+            errors.append(e)
+    if not spec_jsons:
+        raise errors[0] if errors else ValueError("Empty response")
+    return spec_jsons
+
+
+def _build_messages(system_prompt: str, style: Optional[str], prompt: str) -> List[dict]:
+    """
+    Build the chat messages for a request.
+    
+    Everything that varies per request goes in the user message, after the
+    static system prompt, so the prompt prefix stays cacheable.
+    """
+    user_prompt = prompt
+    if style:
+        user_prompt = f"Style: {style}\n{prompt}"
+    return [
+        {"role": "system", "content": system_prompt},
+        {"role": "user", "content": user_prompt}
+    ]
+
+
+def _create_completion(messages: List[dict], n: int, response_format: dict):
+    """Start a streamed chat completion with n choices."""
+    return _get_client().chat.completions.create(
+        model="gpt-4o-mini",
+        messages=messages,
+        temperature=0.7,
+        max_tokens=2000,
+        n=n,
+        response_format=response_format,
+        extra_body={"prompt_cache_key": PROMPT_CACHE_KEY},
+        stream=True,
+        stream_options={"include_usage": True},
     )
 
 
+@functools.lru_cache(maxsize=1)
+def _response_schema() -> dict:
+    """
+    SoundSpec JSON schema adapted for OpenAI strict structured outputs.
+    
+    Strict mode requires every property to be listed as required and
+    additionalProperties to be false, and does not accept defaults.
+    """
+    return _strictify(SoundSpec.model_json_schema(by_alias=True))
+
+
+def _strictify(node):
+    if isinstance(node, list):
+        return [_strictify(item) for item in node]
+    if not isinstance(node, dict):
+        return node
+    strict = {}
+    for key, value in node.items():
+        if key in ("properties", "$defs"):
+            # Maps of names to schemas, not schema keywords
+            strict[key] = {name: _strictify(schema) for name, schema in value.items()}
+        elif key not in ("default", "title"):
+            strict[key] = _strictify(value)
+    if "properties" in strict:
+        strict["required"] = list(strict["properties"])
+        strict["additionalProperties"] = False
+    return strict
+
+
+def _parse_spec_json(content: str, prompt: str) -> str:
+    """Validate and enrich one completion's content, returning SoundSpec JSON."""
+    # Parse straight from the JSON text, without building an intermediate dict
+    spec = SoundSpec.model_validate_json(content)
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Received layers: %s", [(layer.id, layer.type.value) for layer in spec.layers])
+    spec = _ensure_rich_layers(spec, prompt)
+    return spec.model_dump_json(by_alias=True)
+
+
+def _read_stream(stream, n: int = 1) -> List[str]:
+    """
+    Accumulate streamed completion deltas into the content of each of n choices.
+    
+    A choice is dropped as soon as its output is clearly not a SoundSpec (not
+    a JSON object, or an unsupported version). If every choice is dropped the
+    stream is closed, which stops generation, and ValueError is raised.
+    """
+    parts = [[] for _ in range(n)]
+    unchecked = set(range(n))
+    rejected = set()
+    for chunk in stream:
+        if chunk.usage is not None:
+            _log_cache_usage(chunk)
+        for choice in chunk.choices:
+            index = choice.index
+            if not choice.delta.content or index in rejected:
+                continue
+            parts[index].append(choice.delta.content)
+            if index in unchecked:
+                looks_valid = _check_spec_header("".join(parts[index]))
+                if looks_valid is not None:
+                    unchecked.discard(index)
+                    if not looks_valid:
+                        rejected.add(index)
+        if len(rejected) == n:
+            close = getattr(stream, "close", None)
+            if close is not None:
+                close()
+            raise ValueError("Response is not a supported SoundSpec")
+    return ["".join(p) for p in parts]
+
+
+def _check_spec_header(content: str) -> Optional[bool]:
+    """Judge a partial response by its start: True/False once known, else None."""
+    stripped = content.lstrip()
+    if not stripped:
+        return None
+    if stripped[0] != "{":
+        return False
+    match = _VERSION_RE.search(stripped)
+    if match is None:
+        return None
+    return match.group(1) == _SPEC_VERSION
+
+
+def _log_cache_usage(response) -> None:
+    """Log how many prompt tokens were served from the provider cache."""
+    usage = getattr(response, "usage", None)
+    details = getattr(usage, "prompt_tokens_details", None)
+    cached_tokens = getattr(details, "cached_tokens", None)
+    if cached_tokens is not None:
+        logger.debug(
+            "Prompt cache: %s/%s prompt tokens cached",
+            cached_tokens,
+            usage.prompt_tokens,
+        )
+
+
+def _mock_generator(prompt: str, style: Optional[str]) -> SoundSpec:
+    """Fallback mock generator when OpenAI API is unavailable."""
+    # Return a reasonable default based on keywords, scanning the prompt once
+    matched = {_MOCK_KEYWORDS[hit] for hit in _classify(prompt) if hit in _MOCK_KEYWORDS}
+    for name in _MOCK_PRIORITY:
+        if name in matched:
+            return load_builtin_spec(name)
+    # Default to gentle pickup
+    return get_default_pickup()
+
+
+def _mock_variations(prompt: str, style: Optional[str], n: int) -> List[SoundSpec]:
+    """Mock variations: the mock spec re-seeded n times."""
+    specs = []
+    for i in range(n):
+        spec = _mock_generator(prompt, style)
+        spec.name = f"{spec.name}_{i + 1}"
+        spec.seed += i
+        specs.append(spec)
+    return specs
+
+
+def _classify(prompt: str) -> frozenset[str]:
+    """Find which known keywords occur in a prompt, in a single pass."""
+    return frozenset(m.group() for m in _PROMPT_KEYWORD_RE.finditer(prompt.lower()))
+
+
 def _unique_id(existing_ids: set[str], base: str) -> str:
     if base not in existing_ids:
         return base
@@ -176,21 +505,38 @@ def _unique_id(existing_ids: set[str], base: str) -> str:
 
 
 def _ensure_rich_layers(spec: SoundSpec, prompt: str) -> SoundSpec:
-    if len(spec.layers) >= 2 or _is_pure_tone_prompt(prompt):
+    if len(spec.layers) >= 2:
+        return spec
+    hits = _classify(prompt)
+    if hits & _PURE_TONE_PHRASES:
         return spec
 
-    spec_dict = spec.model_dump(by_alias=True)
-    layers = spec_dict.get("layers", [])
-    params = spec_dict.get("params", [])
+    _, layer_template, param_template = next(
+        (enrichment for enrichment in _ENRICHMENTS if enrichment[0] & hits),
+        _DEFAULT_ENRICHMENT,
+    )
+    layer_id = _unique_id({layer.id for layer in spec.layers}, layer_template["id"])
+    param_id = _unique_id({param.id for param in spec.params}, param_template["id"])
+
+    # Validate only the new parts; the rest of the spec is already valid
+    spec.layers.append(Layer.model_validate({**layer_template, "id": layer_id}))
+    if len(spec.params) < _MAX_PARAMS:
+        spec.params.append(Param.model_validate({
+            **param_template,
+            "id": param_id,
+            "path": f"layers_by_id.{layer_id}.{param_template['path']}",
+        }))
+    return spec
 
-    existing_layer_ids = {layer["id"] for layer in layers}
-    existing_param_ids = {param["id"] for param in params}
-    prompt_lower = prompt.lower()
 
-    if "laser" in prompt_lower:
-        layer_id = _unique_id(existing_layer_ids, "laser_chirp")
-        layers.append({
-            "id": layer_id,
+# (trigger keywords, layer template, param template) for _ensure_rich_layers;
+# the first match wins. Template ids are bases made unique per spec, and param
+# paths are relative to the added layer.
+_ENRICHMENTS = (
+    (
+        frozenset({"laser"}),
+        {
+            "id": "laser_chirp",
             "type": "chirp",
             "amp": 0.6,
             "pan": 0.0,
@@ -204,21 +550,22 @@ def _ensure_rich_layers(spec: SoundSpec, prompt: str) -> SoundSpec:
                 "vibrato_hz": 0.0,
                 "vibrato_depth": 0.0,
             },
-        })
-        params.append({
-            "id": _unique_id(existing_param_ids, "laser_start_freq"),
+        },
+        {
+            "id": "laser_start_freq",
             "label": "Laser Start Frequency",
             "kind": "slider",
             "min": 800.0,
             "max": 2400.0,
             "step": 20.0,
             "default": 1600.0,
-            "path": f"layers_by_id.{layer_id}.chirp.f_start",
-        })
-    elif any(keyword in prompt_lower for keyword in ("explosion", "boom", "blast")):
-        layer_id = _unique_id(existing_layer_ids, "blast_noise")
-        layers.append({
-            "id": layer_id,
+            "path": "chirp.f_start",
+        },
+    ),
+    (
+        frozenset({"explosion", "boom", "blast"}),
+        {
+            "id": "blast_noise",
             "type": "noise",
             "amp": 0.7,
             "pan": 0.0,
@@ -230,271 +577,88 @@ def _ensure_rich_layers(spec: SoundSpec, prompt: str) -> SoundSpec:
                 "cutoff_end": 900.0,
                 "cutoff_curve": "exponential",
             },
-        })
-        params.append({
-            "id": _unique_id(existing_param_ids, "blast_cutoff"),
+        },
+        {
+            "id": "blast_cutoff",
             "label": "Blast Cutoff",
             "kind": "slider",
             "min": 500.0,
             "max": 12000.0,
             "step": 100.0,
             "default": 6000.0,
-            "path": f"layers_by_id.{layer_id}.noise.cutoff_start",
-        })
-    elif any(keyword in prompt_lower for keyword in ("pickup", "collect", "sparkle", "diamond")):
-        layer_id = _unique_id(existing_layer_ids, "sparkle_ping")
-        layers.append({
-            "id": layer_id,
+            "path": "noise.cutoff_start",
+        },
+    ),
+    (
+        frozenset({"pickup", "collect", "sparkle", "diamond"}),
+        {
+            "id": "sparkle_ping",
             "type": "impulse",
             "amp": 0.5,
             "pan": 0.0,
             "phase": 0.0,
             "env": {"attack": 0.001, "decay": 0.2, "shape": "exp"},
             "impulse": {"kind": "metal_ping", "width": 0.004, "tone_freq": 1900.0},
-        })
-        params.append({
-            "id": _unique_id(existing_param_ids, "sparkle_freq"),
+        },
+        {
+            "id": "sparkle_freq",
             "label": "Sparkle Frequency",
             "kind": "slider",
             "min": 1000.0,
             "max": 3200.0,
             "step": 50.0,
             "default": 1900.0,
-            "path": f"layers_by_id.{layer_id}.impulse.tone_freq",
-        })
-    elif any(keyword in prompt_lower for keyword in ("shield", "deflect", "plink")):
-        layer_id = _unique_id(existing_layer_ids, "deflect_ping")
-        layers.append({
-            "id": layer_id,
+            "path": "impulse.tone_freq",
+        },
+    ),
+    (
+        frozenset({"shield", "deflect", "plink"}),
+        {
+            "id": "deflect_ping",
             "type": "impulse",
             "amp": 0.55,
             "pan": 0.0,
             "phase": 0.0,
             "env": {"attack": 0.001, "decay": 0.25, "shape": "exp"},
             "impulse": {"kind": "metal_ping", "width": 0.005, "tone_freq": 1600.0},
-        })
-        params.append({
-            "id": _unique_id(existing_param_ids, "deflect_freq"),
+        },
+        {
+            "id": "deflect_freq",
             "label": "Deflect Frequency",
             "kind": "slider",
             "min": 800.0,
             "max": 2600.0,
             "step": 50.0,
             "default": 1600.0,
-            "path": f"layers_by_id.{layer_id}.impulse.tone_freq",
-        })
-    else:
-        layer_id = _unique_id(existing_layer_ids, "air_bed")
-        layers.append({
-            "id": layer_id,
-            "type": "noise",
-            "amp": 0.25,
-            "pan": 0.0,
-            "phase": 0.0,
-            "env": {"attack": 0.01, "decay": 0.3, "shape": "exp"},
-            "noise": {
-                "color": "white",
-                "cutoff_start": 9000.0,
-                "cutoff_end": 4000.0,
-                "cutoff_curve": "exponential",
-            },
-        })
-        params.append({
-            "id": _unique_id(existing_param_ids, "air_cutoff"),
-            "label": "Air Cutoff",
-            "kind": "slider",
-            "min": 2000.0,
-            "max": 14000.0,
-            "step": 250.0,
-            "default": 9000.0,
-            "path": f"layers_by_id.{layer_id}.noise.cutoff_start",
-        })
-
-    spec_dict["layers"] = layers
-    spec_dict["params"] = params
-    return SoundSpec.model_validate(spec_dict)
-
-
-def _create_laser_spec() -> SoundSpec:
-    """Create a laser sound spec."""
-    return SoundSpec.model_validate({
-        "version": "soundspec-1",
-        "name": "laser_blast",
-        "description": "Descending laser blast",
-        "sample_rate": 44100,
-        "duration": 0.4,
-        "seed": 42,
-        "global": {"amp": 0.8, "normalize": True},
-        "layers": [
-            {
-                "id": "main",
-                "type": "chirp",
-                "amp": 0.9,
-                "pan": 0.0,
-                "phase": 0.0,
-                "env": {"attack": 0.01, "decay": 0.3, "shape": "exp"},
-                "chirp": {
-                    "waveform": "saw",
-                    "f_start": 1200.0,
-                    "f_end": 200.0,
-                    "curve": "exponential",
-                    "vibrato_hz": 0.0,
-                    "vibrato_depth": 0.0
-                }
-            }
-        ],
-        "fx_chain": [
-            {
-                "type": "softclip",
-                "enabled": True,
-                "params": {"drive": 1.5}
-            }
-        ],
-        "params": [
-            {
-                "id": "start_freq",
-                "label": "Start Frequency",
-                "kind": "slider",
-                "min": 800.0,
-                "max": 2000.0,
-                "step": 10.0,
-                "default": 1200.0,
-                "path": "layers_by_id.main.chirp.f_start"
-            },
-            {
-                "id": "end_freq",
-                "label": "End Frequency",
-                "kind": "slider",
-                "min": 100.0,
-                "max": 500.0,
-                "step": 10.0,
-                "default": 200.0,
-                "path": "layers_by_id.main.chirp.f_end"
-            },
-            {
-                "id": "duration",
-                "label": "Duration",
-                "kind": "slider",
-                "min": 0.1,
-                "max": 1.0,
-                "step": 0.05,
-                "default": 0.4,
-                "path": "duration"
-            }
-        ]
-    })
-
-
-def _create_explosion_spec() -> SoundSpec:
-    """Create an explosion sound spec."""
-    return SoundSpec.model_validate({
-        "version": "soundspec-1",
-        "name": "explosion",
-        "description": "Explosion with rumble",
-        "sample_rate": 44100,
-        "duration": 1.2,
-        "seed": 123,
-        "global": {"amp": 0.85, "normalize": True},
-        "layers": [
-            {
-                "id": "rumble",
-                "type": "osc",
-                "amp": 0.6,
-                "pan": 0.0,
-                "phase": 0.0,
-                "env": {"attack": 0.01, "decay": 0.8, "shape": "exp"},
-                "osc": {"waveform": "sine", "freq": 60.0, "detune": 0.0},
-                "filter": [
-                    {"type": "biquad_lp", "cutoff": 800.0, "cutoff_end": 100.0, "curve": "exponential", "q": 0.707}
-                ]
-            },
-            {
-                "id": "crack",
-                "type": "noise",
-                "amp": 0.8,
-                "pan": 0.0,
-                "phase": 0.0,
-                "env": {"attack": 0.001, "decay": 0.15, "shape": "exp"},
-                "noise": {"color": "white", "cutoff_start": 8000.0, "cutoff_end": 2000.0, "cutoff_curve": "exponential"}
-            }
-        ],
-        "fx_chain": [],
-        "params": [
-            {
-                "id": "rumble_freq",
-                "label": "Rumble Frequency",
-                "kind": "slider",
-                "min": 40.0,
-                "max": 120.0,
-                "step": 5.0,
-                "default": 60.0,
-                "path": "layers_by_id.rumble.osc.freq"
-            },
-            {
-                "id": "crack_amp",
-                "label": "Crack Intensity",
-                "kind": "slider",
-                "min": 0.0,
-                "max": 1.0,
-                "step": 0.05,
-                "default": 0.8,
-                "path": "layers_by_id.crack.amp"
-            }
-        ]
-    })
-
-
-def _create_shield_spec() -> SoundSpec:
-    """Create a shield deflection sound spec."""
-    return SoundSpec.model_validate({
-        "version": "soundspec-1",
-        "name": "shield_deflect",
-        "description": "Shield deflection with ring",
-        "sample_rate": 44100,
-        "duration": 0.6,
-        "seed": 789,
-        "global": {"amp": 0.75, "normalize": True},
-        "layers": [
-            {
-                "id": "ping",
-                "type": "impulse",
-                "amp": 0.7,
-                "pan": 0.0,
-                "phase": 0.0,
-                "env": {"attack": 0.001, "decay": 0.3, "shape": "exp"},
-                "impulse": {"kind": "metal_ping", "width": 0.005, "tone_freq": 1800.0}
-            },
-            {
-                "id": "shimmer",
-                "type": "fm",
-                "amp": 0.5,
-                "pan": 0.0,
-                "phase": 0.0,
-                "env": {"attack": 0.05, "decay": 0.4, "shape": "exp"},
-                "fm": {"carrier_freq": 2400.0, "mod_freq": 7.0, "index": 3.0, "brightness": 0.6}
-            }
-        ],
-        "fx_chain": [],
-        "params": [
-            {
-                "id": "ping_freq",
-                "label": "Ping Frequency",
-                "kind": "slider",
-                "min": 1000.0,
-                "max": 3000.0,
-                "step": 100.0,
-                "default": 1800.0,
-                "path": "layers_by_id.ping.impulse.tone_freq"
-            },
-            {
-                "id": "shimmer_brightness",
-                "label": "Shimmer Brightness",
-                "kind": "slider",
-                "min": 0.0,
-                "max": 1.0,
-                "step": 0.05,
-                "default": 0.6,
-                "path": "layers_by_id.shimmer.fm.brightness"
-            }
-        ]
-    })
+            "path": "impulse.tone_freq",
+        },
+    ),
+)
+
+_DEFAULT_ENRICHMENT = (
+    frozenset(),
+    {
+        "id": "air_bed",
+        "type": "noise",
+        "amp": 0.25,
+        "pan": 0.0,
+        "phase": 0.0,
+        "env": {"attack": 0.01, "decay": 0.3, "shape": "exp"},
+        "noise": {
+            "color": "white",
+            "cutoff_start": 9000.0,
+            "cutoff_end": 4000.0,
+            "cutoff_curve": "exponential",
+        },
+    },
+    {
+        "id": "air_cutoff",
+        "label": "Air Cutoff",
+        "kind": "slider",
+        "min": 2000.0,
+        "max": 14000.0,
+        "step": 250.0,
+        "default": 9000.0,
+        "path": "noise.cutoff_start",
+    },
+)
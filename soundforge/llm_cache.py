@@ -0,0 +1,78 @@
+"""Exact-match cache of generated SoundSpec JSON, persisted in SQLite."""
+
+import hashlib
+import sqlite3
+import threading
+import contextlib
+from pathlib import Path
+from typing import Iterator, Optional
+
+
+def prompt_key(system_prompt: str, style: Optional[str], prompt: str) -> str:
+    """
+    Hash everything that determines a generation request.
+
+    Including the system prompt means cached specs are invalidated whenever
+    the prompt is revised.
+    """
+    digest = hashlib.sha256()
+    for part in (system_prompt, style or "", prompt):
+        digest.update(part.encode())
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+class ExactCache:
+    """
+    Maps prompt keys to SoundSpec JSON.
+
+    With a path, entries are stored in a SQLite database so they survive
+    restarts; otherwise they are kept in memory. Database errors are treated
+    as cache misses.
+    """
+
+    def __init__(self, path: Optional[Path] = None):
+        self.path = Path(path) if path is not None else None
+        self._memory: dict[str, str] = {}
+        self._lock = threading.Lock()
+        if self.path is not None:
+            try:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                with self._connect() as db:
+                    db.execute("CREATE TABLE IF NOT EXISTS specs (key TEXT PRIMARY KEY, spec TEXT NOT NULL)")
+            except (OSError, sqlite3.Error):
+                self.path = None
+
+    def get(self, key: str) -> Optional[str]:
+        """Return the cached SoundSpec JSON for a key, if any."""
+        with self._lock:
+            if self.path is None:
+                return self._memory.get(key)
+            try:
+                with self._connect() as db:
+                    row = db.execute("SELECT spec FROM specs WHERE key = ?", (key,)).fetchone()
+            except sqlite3.Error:
+                return None
+            return row[0] if row else None
+
+    def put(self, key: str, spec_json: str) -> None:
+        """Store the SoundSpec JSON generated for a key."""
+        with self._lock:
+            if self.path is None:
+                self._memory[key] = spec_json
+                return
+            try:
+                with self._connect() as db:
+                    db.execute("INSERT OR REPLACE INTO specs VALUES (?, ?)", (key, spec_json))
+            except sqlite3.Error:
+                pass
+
+    @contextlib.contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """Open a connection that commits on success and is always closed."""
+        db = sqlite3.connect(self.path, timeout=5.0)
+        try:
+            with db:
+                yield db
+        finally:
+            db.close()
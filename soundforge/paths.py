@@ -1,9 +1,18 @@
 """Parameter path resolver for updating SoundSpec values."""
 
+import functools
 import re
-from typing import Any
+from typing import Any, Callable, Optional
 from soundforge.schema import SoundSpec
 
+# Paths like "layers[0].amp" or "fx[0].enabled"
+_ARRAY_RE = re.compile(r'(\w+)\[(\d+)\]\.?(.*)')
+
+# Finds the object a path points into, or None if it is missing
+Resolver = Callable[[SoundSpec], Any]
+# Applies a widget value to a spec, returning whether anything changed
+Setter = Callable[[SoundSpec, Any], bool]
+
 
 def update_spec_from_param(spec: SoundSpec, path: str, value: Any) -> bool:
     """
@@ -17,274 +26,179 @@ def update_spec_from_param(spec: SoundSpec, path: str, value: Any) -> bool:
     - fx[0].params.drive
     - fx_by_type.softclip.params.drive
     
-    Returns True if update succeeded, False otherwise.
+    Returns True if update succeeded, False otherwise. Successful updates
+    bump spec.revision.
     """
     try:
-        # Check for array notation before splitting
-        if '[' in path:
-            # Handle paths like "layers[0].amp" or "fx[0].enabled"
-            match = re.match(r'(\w+)\[(\d+)\]\.?(.*)', path)
-            if match:
-                prefix, index, remainder = match.groups()
-                if prefix == 'layers':
-                    idx = int(index)
-                    if idx >= len(spec.layers):
-                        return False
-                    layer = spec.layers[idx]
-                    if not remainder:
-                        return False
-                    return _update_layer_field(layer, remainder.split('.'), value)
-                elif prefix == 'fx':
-                    idx = int(index)
-                    if idx >= len(spec.fx_chain):
-                        return False
-                    fx = spec.fx_chain[idx]
-                    if not remainder:
-                        return False
-                    return _update_fx_field(fx, remainder.split('.'), value)
-        
-        # Normal dot-separated paths
-        parts = path.split('.')
-        
-        if parts[0] == 'global':
-            return _update_global(spec, parts[1:], value)
-        elif parts[0] == 'duration':
-            spec.duration = float(value)
-            return True
-        elif parts[0] == 'layers_by_id':
-            return _update_layers_by_id(spec, parts[1:], value)
-        elif parts[0] == 'fx_by_type':
-            return _update_fx_by_type(spec, parts[1:], value)
-        
-        return False
+        setter = _compile_setter(path)
+        updated = setter is not None and setter(spec, value)
     except Exception:
         return False
+    if updated:
+        spec._revision += 1
+    return updated
 
 
-def _update_global(spec: SoundSpec, parts: list[str], value: Any) -> bool:
-    """Update global settings."""
+@functools.lru_cache(maxsize=256)
+def _compile_setter(path: str) -> Optional[Setter]:
+    """
+    Parse a path once into a setter taking (spec, value).
+    
+    Widgets send the same few paths on every rerun, so the parse is cached
+    and only the layer/fx lookup and the assignment run per update. Returns
+    None for paths that can never be set.
+    """
+    # Check for array notation before splitting
+    if '[' in path:
+        match = _ARRAY_RE.match(path)
+        if match:
+            prefix, index, remainder = match.groups()
+            if prefix == 'layers':
+                if not remainder:
+                    return None
+                return _compile_layer_field(_layer_at(int(index)), remainder.split('.'))
+            elif prefix == 'fx':
+                if not remainder:
+                    return None
+                return _compile_fx_field(_fx_at(int(index)), remainder.split('.'))
+    
+    # Normal dot-separated paths; only the head picks the branch
+    head, _, rest = path.partition('.')
+    parts = rest.split('.')
+    
+    if head == 'global':
+        return _field_setter(_global_settings, _GLOBAL_SETTERS, parts[0])
+    elif head == 'duration':
+        return _field_setter(_spec_root, _SPEC_SETTERS, head)
+    elif head == 'layers_by_id':
+        layer_id = parts[0]
+        return _compile_layer_field(lambda spec: spec.layer_by_id(layer_id), parts[1:])
+    elif head == 'fx_by_type':
+        fx_type = parts[0]
+        return _compile_fx_field(lambda spec: spec.fx_by_type(fx_type), parts[1:])
+    
+    return None
+
+
+def _compile_layer_field(resolve_layer: Resolver, parts: list[str]) -> Optional[Setter]:
+    """Build a setter for a field within a layer."""
     if not parts:
-        return False
+        return None
     
     field = parts[0]
-    if field == 'amp':
-        spec.global_.amp = float(value)
-        return True
-    elif field == 'normalize':
-        spec.global_.normalize = bool(value)
-        return True
     
-    return False
-
-
-
-def _update_layers_by_id(spec: SoundSpec, parts: list[str], value: Any) -> bool:
-    """Update layer by ID."""
-    if not parts:
-        return False
+    # Direct layer fields
+    if field in _LAYER_SETTERS:
+        return _field_setter(resolve_layer, _LAYER_SETTERS, field)
     
-    layer_id = parts[0]
-    layer = next((l for l in spec.layers if l.id == layer_id), None)
-    if not layer:
-        return False
+    # Nested type-specific params
+    setters = _LAYER_SUBOBJECT_SETTERS.get(field)
+    if setters is None or len(parts) < 2:
+        return None
+    
+    subfield = parts[1]
+    
+    def resolve(spec: SoundSpec):
+        layer = resolve_layer(spec)
+        subobject = getattr(layer, field) if layer is not None else None
+        # Only tone impulses have a tone frequency to adjust
+        if field == 'impulse' and subfield == 'tone_freq' and subobject is not None and subobject.tone_freq is None:
+            return None
+        return subobject
     
-    return _update_layer_field(layer, parts[1:], value)
+    return _field_setter(resolve, setters, subfield)
 
 
-def _update_layer_field(layer, parts: list[str], value: Any) -> bool:
-    """Update a field within a layer."""
+def _compile_fx_field(resolve_fx: Resolver, parts: list[str]) -> Optional[Setter]:
+    """Build a setter for an FX field."""
     if not parts:
-        return False
-    
-    field = parts[0]
+        return None
     
-    # Direct layer fields
-    if field == 'amp':
-        layer.amp = float(value)
-        return True
-    elif field == 'pan':
-        layer.pan = float(value)
-        return True
-    elif field == 'phase':
-        layer.phase = float(value)
-        return True
+    if parts[0] == 'enabled':
+        return _field_setter(resolve_fx, _FX_SETTERS, parts[0])
     
-    # Nested type-specific params
-    if len(parts) < 2:
-        return False
+    if parts[0] == 'params' and len(parts) > 1:
+        return _field_setter(lambda spec: _params_of(resolve_fx(spec)), _FX_PARAM_SETTERS, parts[1])
     
-    subfield = parts[1]
+    return None
+
+
+def _field_setter(resolve: Resolver, setters: dict[str, Callable[[Any], Any]], field: str) -> Optional[Setter]:
+    """Bind a field listed in a setter table to the object a resolver finds."""
+    coerce = setters.get(field)
+    if coerce is None:
+        return None
     
-    if field == 'osc' and layer.osc:
-        return _update_osc_field(layer.osc, subfield, value)
-    elif field == 'chirp' and layer.chirp:
-        return _update_chirp_field(layer.chirp, subfield, value)
-    elif field == 'fm' and layer.fm:
-        return _update_fm_field(layer.fm, subfield, value)
-    elif field == 'noise' and layer.noise:
-        return _update_noise_field(layer.noise, subfield, value)
-    elif field == 'impulse' and layer.impulse:
-        return _update_impulse_field(layer.impulse, subfield, value)
-    elif field == 'env':
-        return _update_env_field(layer.env, subfield, value)
-    elif field == 'mod' and layer.mod:
-        return _update_mod_field(layer.mod, subfield, value)
+    def setter(spec: SoundSpec, value: Any) -> bool:
+        obj = resolve(spec)
+        if obj is None:
+            return False
+        setattr(obj, field, coerce(value))
+        return True
     
-    return False
+    return setter
 
 
-def _update_osc_field(osc, field: str, value: Any) -> bool:
-    """Update oscillator field."""
-    if field == 'freq':
-        osc.freq = float(value)
-        return True
-    elif field == 'detune':
-        osc.detune = float(value)
-        return True
-    elif field == 'waveform':
-        osc.waveform = value
-        return True
-    return False
+def _spec_root(spec: SoundSpec) -> SoundSpec:
+    return spec
 
 
-def _update_chirp_field(chirp, field: str, value: Any) -> bool:
-    """Update chirp field."""
-    if field == 'f_start':
-        chirp.f_start = float(value)
-        return True
-    elif field == 'f_end':
-        chirp.f_end = float(value)
-        return True
-    elif field == 'vibrato_hz':
-        chirp.vibrato_hz = float(value)
-        return True
-    elif field == 'vibrato_depth':
-        chirp.vibrato_depth = float(value)
-        return True
-    elif field == 'waveform':
-        chirp.waveform = value
-        return True
-    return False
+def _global_settings(spec: SoundSpec):
+    return spec.global_
 
 
-def _update_fm_field(fm, field: str, value: Any) -> bool:
-    """Update FM field."""
-    if field == 'carrier_freq':
-        fm.carrier_freq = float(value)
-        return True
-    elif field == 'mod_freq':
-        fm.mod_freq = float(value)
-        return True
-    elif field == 'index':
-        fm.index = float(value)
-        return True
-    elif field == 'brightness':
-        fm.brightness = float(value)
-        return True
-    return False
+def _layer_at(idx: int) -> Resolver:
+    return lambda spec: spec.layers[idx] if idx < len(spec.layers) else None
 
 
-def _update_noise_field(noise, field: str, value: Any) -> bool:
-    """Update noise field."""
-    if field == 'cutoff_start':
-        noise.cutoff_start = float(value)
-        return True
-    elif field == 'cutoff_end':
-        noise.cutoff_end = float(value)
-        return True
-    return False
+def _fx_at(idx: int) -> Resolver:
+    return lambda spec: spec.fx_chain[idx] if idx < len(spec.fx_chain) else None
 
 
-def _update_impulse_field(impulse, field: str, value: Any) -> bool:
-    """Update impulse field."""
-    if field == 'width':
-        impulse.width = float(value)
-        return True
-    elif field == 'tone_freq' and impulse.tone_freq is not None:
-        impulse.tone_freq = float(value)
-        return True
-    return False
+def _params_of(fx):
+    return fx.params if fx is not None else None
 
 
-def _update_env_field(env, field: str, value: Any) -> bool:
-    """Update envelope field."""
-    if field == 'attack':
-        env.attack = float(value)
-        return True
-    elif field == 'decay':
-        env.decay = float(value)
-        return True
-    elif field == 'sustain':
-        env.sustain = float(value)
-        return True
-    elif field == 'release':
-        env.release = float(value)
-        return True
-    return False
+def _identity(value: Any) -> Any:
+    return value
 
 
-def _update_mod_field(mod, field: str, value: Any) -> bool:
-    """Update modulation field."""
-    if field == 'tremolo_hz':
-        mod.tremolo_hz = float(value)
-        return True
-    elif field == 'tremolo_depth':
-        mod.tremolo_depth = float(value)
-        return True
-    elif field == 'pitch_lfo_hz':
-        mod.pitch_lfo_hz = float(value)
-        return True
-    elif field == 'pitch_lfo_depth':
-        mod.pitch_lfo_depth = float(value)
-        return True
-    return False
+# Settable fields -> coercion applied to the incoming widget value
+_SPEC_SETTERS = {'duration': float}
 
+_GLOBAL_SETTERS = {'amp': float, 'normalize': bool}
 
+_LAYER_SETTERS = {'amp': float, 'pan': float, 'phase': float}
 
-def _update_fx_by_type(spec: SoundSpec, parts: list[str], value: Any) -> bool:
-    """Update FX by type."""
-    if not parts:
-        return False
-    
-    fx_type = parts[0]
-    fx = next((f for f in spec.fx_chain if f.type.value == fx_type), None)
-    if not fx:
-        return False
-    
-    return _update_fx_field(fx, parts[1:], value)
+_LAYER_SUBOBJECT_SETTERS = {
+    'osc': {'freq': float, 'detune': float, 'waveform': _identity},
+    'chirp': {
+        'f_start': float,
+        'f_end': float,
+        'vibrato_hz': float,
+        'vibrato_depth': float,
+        'waveform': _identity,
+    },
+    'fm': {'carrier_freq': float, 'mod_freq': float, 'index': float, 'brightness': float},
+    'noise': {'cutoff_start': float, 'cutoff_end': float},
+    'impulse': {'width': float, 'tone_freq': float},
+    'env': {'attack': float, 'decay': float, 'sustain': float, 'release': float},
+    'mod': {
+        'tremolo_hz': float,
+        'tremolo_depth': float,
+        'pitch_lfo_hz': float,
+        'pitch_lfo_depth': float,
+    },
+}
 
+_FX_SETTERS = {'enabled': bool}
 
-def _update_fx_field(fx, parts: list[str], value: Any) -> bool:
-    """Update FX field."""
-    if not parts:
-        return False
-    
-    if parts[0] == 'enabled':
-        fx.enabled = bool(value)
-        return True
-    
-    if parts[0] == 'params' and len(parts) > 1:
-        field = parts[1]
-        if field == 'drive':
-            fx.params.drive = float(value)
-            return True
-        elif field == 'steps':
-            fx.params.steps = int(value)
-            return True
-        elif field == 'hold_samples':
-            fx.params.hold_samples = int(value)
-            return True
-        elif field == 'time_ms':
-            fx.params.time_ms = float(value)
-            return True
-        elif field == 'feedback':
-            fx.params.feedback = float(value)
-            return True
-        elif field == 'mix':
-            fx.params.mix = float(value)
-            return True
-        elif field == 'target_peak':
-            fx.params.target_peak = float(value)
-            return True
-    
-    return False
+_FX_PARAM_SETTERS = {
+    'drive': float,
+    'steps': int,
+    'hold_samples': int,
+    'time_ms': float,
+    'feedback': float,
+    'mix': float,
+    'target_peak': float,
+}
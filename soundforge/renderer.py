@@ -1,13 +1,41 @@
 """Audio synthesis and rendering engine."""
 
+import os
 import math
 import random
-from typing import List
+import functools
+from itertools import repeat
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterator
+import numpy as np
 from soundforge.schema import (
     SoundSpec, Layer, LayerType, Waveform, Curve, NoiseColor,
     ImpulseKind, EnvelopeShape, FilterType, FXType, Filter
 )
-from soundforge.util_wav import encode_wav
+from soundforge.util_wav import encode_wav, encode_wav_chunks, wav_header
+
+try:
+    from numba import njit
+    HAVE_NUMBA = True
+except ImportError:
+    HAVE_NUMBA = False
+
+    def njit(*args, **kwargs):
+        """Run kernels as plain Python when numba is not installed."""
+        if args and callable(args[0]):
+            return args[0]
+        return lambda func: func
+
+_TWO_PI = 2.0 * math.pi
+_INV_TWO_PI = 1.0 / _TWO_PI
+
+# Threads for rendering layers concurrently; 1 renders them in order
+LAYER_WORKERS = min(8, os.cpu_count() or 1)
+
+
+def _kernel_input(a: np.ndarray):
+    """Compiled kernels index arrays directly; interpreted ones are faster on lists."""
+    return a if HAVE_NUMBA else a.tolist()
 
 
 def render_wav_bytes(spec: SoundSpec) -> bytes:
@@ -16,24 +44,59 @@ def render_wav_bytes(spec: SoundSpec) -> bytes:
     return encode_wav(samples, spec.sample_rate)
 
 
-def render_samples(spec: SoundSpec) -> List[float]:
-    """Render a SoundSpec to float samples."""
+def render_wav_bytes_cached(spec: SoundSpec) -> bytes:
+    """
+    Render a SoundSpec to WAV file bytes, reusing recent identical renders.
+    
+    Rendering is deterministic, so results are memoized on the spec's JSON.
+    """
+    return _render_wav_json(spec.model_dump_json(by_alias=True))
+
+
+@functools.lru_cache(maxsize=64)
+def _render_wav_json(spec_json: str) -> bytes:
+    return render_wav_bytes(SoundSpec.model_validate_json(spec_json))
+
+
+def render_wav_chunks(spec: SoundSpec, chunk_ms: float = 100.0) -> Iterator[bytes]:
+    """
+    Render a SoundSpec to WAV bytes, yielded progressively.
+    
+    The header is yielded before synthesis starts (its size is known from the
+    spec), followed by PCM data in chunks of roughly chunk_ms. Joined together
+    the chunks equal render_wav_bytes(spec).
+    """
+    num_samples = int(spec.duration * spec.sample_rate)
+    yield wav_header(num_samples, spec.sample_rate)
+    chunk_size = max(1, int(spec.sample_rate * chunk_ms / 1000.0))
+    yield from encode_wav_chunks(render_samples(spec), chunk_size)
+
+
+def render_samples(spec: SoundSpec) -> np.ndarray:
+    """Render a SoundSpec to float32 samples."""
     num_samples = int(spec.duration * spec.sample_rate)
-    samples = [0.0] * num_samples
+    samples = np.zeros(num_samples, dtype=np.float32)
     
-    # Initialize PRNG with seed
+    # Initialize PRNG with seed; each layer gets its own stream, seeded in
+    # layer order, so layers can render concurrently and stay deterministic
     rng = random.Random(spec.seed)
+    layer_rngs = [random.Random(rng.getrandbits(64)) for _ in spec.layers]
     
     # Render each layer
-    for layer in spec.layers:
-        layer_samples = render_layer(layer, spec.duration, spec.sample_rate, rng)
+    layer_args = (spec.layers, repeat(spec.duration), repeat(spec.sample_rate), layer_rngs)
+    if len(spec.layers) > 1 and LAYER_WORKERS > 1:
+        rendered = _layer_pool().map(render_layer, *layer_args)
+    else:
+        rendered = map(render_layer, *layer_args)
+    
+    for layer_samples in rendered:
         # Mix layer into output
-        for i in range(min(len(samples), len(layer_samples))):
-            samples[i] += layer_samples[i]
+        n = min(samples.size, layer_samples.size)
+        samples[:n] += layer_samples[:n]
     
     # Apply global amplitude
-    for i in range(len(samples)):
-        samples[i] *= spec.global_.amp
+    if spec.global_.amp != 1.0:
+        samples *= spec.global_.amp
     
     # Apply FX chain
     for fx in spec.fx_chain:
@@ -47,7 +110,13 @@ def render_samples(spec: SoundSpec) -> List[float]:
     return samples
 
 
-def render_layer(layer: Layer, duration: float, sample_rate: int, rng: random.Random) -> List[float]:
+@functools.lru_cache(maxsize=None)
+def _layer_pool() -> ThreadPoolExecutor:
+    """Get the shared pool for rendering layers (NumPy and the kernels release the GIL)."""
+    return ThreadPoolExecutor(max_workers=LAYER_WORKERS, thread_name_prefix="soundforge-layer")
+
+
+def render_layer(layer: Layer, duration: float, sample_rate: int, rng: random.Random) -> np.ndarray:
     """Render a single layer."""
     num_samples = int(duration * sample_rate)
     
@@ -63,7 +132,7 @@ def render_layer(layer: Layer, duration: float, sample_rate: int, rng: random.Ra
     elif layer.type == LayerType.IMPULSE:
         samples = render_impulse(layer, num_samples, sample_rate, rng)
     else:
-        samples = [0.0] * num_samples
+        samples = np.zeros(num_samples, dtype=np.float32)
     
     # Apply modulation
     if layer.mod:
@@ -78,117 +147,121 @@ def render_layer(layer: Layer, duration: float, sample_rate: int, rng: random.Ra
     samples = apply_envelope(samples, layer.env, sample_rate, duration)
     
     # Apply layer amplitude
-    for i in range(len(samples)):
-        samples[i] *= layer.amp
+    if layer.amp != 1.0:
+        samples *= layer.amp
     
     return samples
 
 
-def render_osc(layer: Layer, num_samples: int, sample_rate: int, rng: random.Random) -> List[float]:
+def render_osc(layer: Layer, num_samples: int, sample_rate: int, rng: random.Random) -> np.ndarray:
     """Render oscillator."""
     osc = layer.osc
-    samples = [0.0] * num_samples
     freq = osc.freq * (2.0 ** (osc.detune / 1200.0))
-    phase = layer.phase
+    if HAVE_NUMBA and osc.waveform == Waveform.SINE and not osc.harmonics and freq * 2.0 < sample_rate:
+        return _sine_kernel(num_samples, freq / sample_rate, layer.phase)
     
-    for i in range(num_samples):
-        t = i / sample_rate
-        phase_rad = 2.0 * math.pi * freq * t + phase
-        samples[i] = generate_waveform(osc.waveform, phase_rad)
-        
-        # Add harmonics
-        if osc.harmonics:
-            for harm in osc.harmonics:
-                harm_phase = phase_rad * harm.mul
-                samples[i] += generate_waveform(osc.waveform, harm_phase) * harm.amp
+    # Phase stays float64 until it is wrapped, so long renders don't drift
+    t = np.arange(num_samples) / sample_rate
+    phase = _TWO_PI * freq * t + layer.phase
+    samples = waveform_samples(osc.waveform, phase)
+    
+    # Add harmonics
+    if osc.harmonics:
+        for harm in osc.harmonics:
+            samples += waveform_samples(osc.waveform, phase * harm.mul) * harm.amp
     
     return samples
 
 
-def render_chirp(layer: Layer, num_samples: int, sample_rate: int, rng: random.Random) -> List[float]:
+@njit(cache=True, nogil=True)
+def _sine_kernel(num_samples, cycles_per_sample, phase):
+    # Magic circle oscillator: a rotation by two multiply-adds per sample.
+    # Starting c half a step back makes s exactly sin(phase + n * step).
+    half_step = math.pi * cycles_per_sample
+    e = 2.0 * math.sin(half_step)
+    s = math.sin(phase)
+    c = math.cos(phase - half_step)
+    out = np.empty(num_samples, dtype=np.float32)
+    for i in range(num_samples):
+        out[i] = s
+        c -= e * s
+        s += e * c
+    return out
+
+
+def render_chirp(layer: Layer, num_samples: int, sample_rate: int, rng: random.Random) -> np.ndarray:
     """Render chirp (frequency sweep)."""
     chirp = layer.chirp
-    samples = [0.0] * num_samples
-    phase = layer.phase
-    
-    for i in range(num_samples):
-        t = i / sample_rate
-        duration = num_samples / sample_rate
-        
-        # Calculate instantaneous frequency
-        if chirp.curve == Curve.LINEAR:
-            freq = chirp.f_start + (chirp.f_end - chirp.f_start) * (t / duration)
-        else:  # EXPONENTIAL
-            ratio = chirp.f_end / chirp.f_start
-            freq = chirp.f_start * (ratio ** (t / duration))
-        
-        # Add vibrato
-        if chirp.vibrato_hz > 0:
-            vibrato = math.sin(2.0 * math.pi * chirp.vibrato_hz * t)
-            freq *= (1.0 + vibrato * chirp.vibrato_depth)
-        
-        phase_rad = phase
-        phase += 2.0 * math.pi * freq / sample_rate
-        
-        samples[i] = generate_waveform(chirp.waveform, phase_rad)
-        
-        # Add harmonics
-        if chirp.harmonics:
-            for harm in chirp.harmonics:
-                samples[i] += generate_waveform(chirp.waveform, phase_rad * harm.mul) * harm.amp
+    t = np.arange(num_samples) / sample_rate
+    progress = np.arange(num_samples) / num_samples
+    
+    # Calculate instantaneous frequency
+    if chirp.curve == Curve.LINEAR:
+        freq = chirp.f_start + (chirp.f_end - chirp.f_start) * progress
+    else:  # EXPONENTIAL
+        ratio = chirp.f_end / chirp.f_start
+        freq = chirp.f_start * (ratio ** progress)
+    
+    # Add vibrato
+    if chirp.vibrato_hz > 0:
+        vibrato = np.sin(_TWO_PI * chirp.vibrato_hz * t)
+        freq *= (1.0 + vibrato * chirp.vibrato_depth)
+    
+    # Each sample uses the phase accumulated before its own increment
+    phase = np.empty(num_samples)
+    phase[:1] = layer.phase
+    np.cumsum(_TWO_PI * freq[:-1] / sample_rate, out=phase[1:])
+    phase[1:] += layer.phase
+    
+    samples = waveform_samples(chirp.waveform, phase)
+    
+    # Add harmonics
+    if chirp.harmonics:
+        for harm in chirp.harmonics:
+            samples += waveform_samples(chirp.waveform, phase * harm.mul) * harm.amp
     
     return samples
 
 
-def render_fm(layer: Layer, num_samples: int, sample_rate: int, rng: random.Random) -> List[float]:
+def render_fm(layer: Layer, num_samples: int, sample_rate: int, rng: random.Random) -> np.ndarray:
     """Render FM synthesis."""
     fm = layer.fm
-    samples = [0.0] * num_samples
+    t = np.arange(num_samples) / sample_rate
+    # Modulator
+    modulator = np.sin(_TWO_PI * fm.mod_freq * t) * fm.index
+    # Carrier with modulation
+    samples = np.sin(_TWO_PI * fm.carrier_freq * t + modulator + layer.phase).astype(np.float32)
     
-    for i in range(num_samples):
-        t = i / sample_rate
-        # Modulator
-        mod_phase = 2.0 * math.pi * fm.mod_freq * t
-        modulator = math.sin(mod_phase) * fm.index
-        # Carrier with modulation
-        carrier_phase = 2.0 * math.pi * fm.carrier_freq * t + modulator
-        samples[i] = math.sin(carrier_phase + layer.phase)
-        
-        # Apply brightness (subtle softclip)
-        if fm.brightness > 0.5:
-            drive = 1.0 + (fm.brightness - 0.5) * 2.0
-            samples[i] = softclip(samples[i] * drive)
+    # Apply brightness (subtle softclip)
+    if fm.brightness > 0.5:
+        drive = 1.0 + (fm.brightness - 0.5) * 2.0
+        samples = softclip(samples * drive)
     
     return samples
 
 
-def render_noise(layer: Layer, num_samples: int, sample_rate: int, rng: random.Random) -> List[float]:
+def render_noise(layer: Layer, num_samples: int, sample_rate: int, rng: random.Random) -> np.ndarray:
     """Render noise."""
     noise = layer.noise
-    samples = [0.0] * num_samples
+    # One draw from the spec's stream seeds a vectorized generator for this layer
+    white = np.random.default_rng(rng.getrandbits(64)).random(num_samples, dtype=np.float32)
+    white *= 2.0
+    white -= 1.0
     
     if noise.color == NoiseColor.WHITE:
-        for i in range(num_samples):
-            samples[i] = rng.uniform(-1.0, 1.0)
+        samples = white
     else:  # PINK - simple approximation
-        b0 = b1 = b2 = b3 = b4 = b5 = b6 = 0.0
-        for i in range(num_samples):
-            white = rng.uniform(-1.0, 1.0)
-            b0 = 0.99886 * b0 + white * 0.0555179
-            b1 = 0.99332 * b1 + white * 0.0750759
-            b2 = 0.96900 * b2 + white * 0.1538520
-            b3 = 0.86650 * b3 + white * 0.3104856
-            b4 = 0.55000 * b4 + white * 0.5329522
-            b5 = -0.7616 * b5 - white * 0.0168980
-            samples[i] = (b0 + b1 + b2 + b3 + b4 + b5 + b6 + white * 0.5362) * 0.11
-            b6 = white * 0.115926
+        samples = _pink_kernel(_kernel_input(white))
     
     # Apply cutoff sweep if specified
     if noise.cutoff_start is not None:
-        cutoff_end = noise.cutoff_end if noise.cutoff_end is not None else noise.cutoff_start
-        filt = Filter(
+        # A missing or equal end cutoff takes the fixed-coefficient path.
+        # NoiseParams already validated the cutoffs, so skip re-validation.
+        cutoff_end = noise.cutoff_end if noise.cutoff_end != noise.cutoff_start else None
+        filt = Filter.model_construct(
             type=FilterType.BIQUAD_LP,
             cutoff=noise.cutoff_start,
+            q=Filter.model_fields["q"].default,
             cutoff_end=cutoff_end,
             curve=noise.cutoff_curve
         )
@@ -197,104 +270,121 @@ def render_noise(layer: Layer, num_samples: int, sample_rate: int, rng: random.R
     return samples
 
 
-def render_impulse(layer: Layer, num_samples: int, sample_rate: int, rng: random.Random) -> List[float]:
+@njit(cache=True, nogil=True)
+def _pink_kernel(white):
+    out = np.empty(len(white), dtype=np.float32)
+    b0 = b1 = b2 = b3 = b4 = b5 = b6 = 0.0
+    for i in range(len(white)):
+        w = white[i]
+        b0 = 0.99886 * b0 + w * 0.0555179
+        b1 = 0.99332 * b1 + w * 0.0750759
+        b2 = 0.96900 * b2 + w * 0.1538520
+        b3 = 0.86650 * b3 + w * 0.3104856
+        b4 = 0.55000 * b4 + w * 0.5329522
+        b5 = -0.7616 * b5 - w * 0.0168980
+        out[i] = (b0 + b1 + b2 + b3 + b4 + b5 + b6 + w * 0.5362) * 0.11
+        b6 = w * 0.115926
+    return out
+
+
+def render_impulse(layer: Layer, num_samples: int, sample_rate: int, rng: random.Random) -> np.ndarray:
     """Render impulse."""
     imp = layer.impulse
-    samples = [0.0] * num_samples
+    samples = np.zeros(num_samples, dtype=np.float32)
     width_samples = int(imp.width * sample_rate)
     
     if imp.kind == ImpulseKind.CLICK:
-        for i in range(min(width_samples, num_samples)):
-            samples[i] = math.exp(-i / (width_samples * 0.3))
+        i = np.arange(min(width_samples, num_samples), dtype=np.float32)
+        samples[:i.size] = np.exp(-i / (width_samples * 0.3))
     elif imp.kind == ImpulseKind.TAP:
-        for i in range(min(width_samples, num_samples)):
-            samples[i] = (1.0 - i / width_samples) * (rng.random() * 0.3 + 0.7)
+        i = np.arange(min(width_samples, num_samples), dtype=np.float32)
+        jitter = np.random.default_rng(rng.getrandbits(64)).random(i.size, dtype=np.float32)
+        samples[:i.size] = (1.0 - i / width_samples) * (jitter * 0.3 + 0.7)
     elif imp.kind == ImpulseKind.METAL_PING:
         freq = imp.tone_freq if imp.tone_freq else 2000.0
-        for i in range(min(width_samples * 10, num_samples)):
-            t = i / sample_rate
-            env = math.exp(-t / imp.width)
-            # Inharmonic partials
-            tone = math.sin(2.0 * math.pi * freq * t)
-            tone += 0.5 * math.sin(2.0 * math.pi * freq * 2.3 * t)
-            tone += 0.3 * math.sin(2.0 * math.pi * freq * 3.7 * t)
-            samples[i] = tone * env
+        t = np.arange(min(width_samples * 10, num_samples)) / sample_rate
+        env = np.exp(-t / imp.width)
+        # Inharmonic partials
+        tone = np.sin(_TWO_PI * freq * t)
+        tone += 0.5 * np.sin(_TWO_PI * freq * 2.3 * t)
+        tone += 0.3 * np.sin(_TWO_PI * freq * 3.7 * t)
+        samples[:t.size] = tone * env
     
     return samples
 
 
-def generate_waveform(waveform: Waveform, phase: float) -> float:
-    """Generate a single sample of a waveform."""
-    phase = phase % (2.0 * math.pi)
+def waveform_samples(waveform: Waveform, phase: np.ndarray) -> np.ndarray:
+    """Generate a waveform over an array of phases (radians)."""
+    # Position within the cycle, in [0, 1)
+    cycle = phase * _INV_TWO_PI
+    cycle -= np.floor(cycle)
+    cycle = cycle.astype(np.float32)
     
     if waveform == Waveform.SINE:
-        return math.sin(phase)
+        cycle *= _TWO_PI
+        return np.sin(cycle, out=cycle)
     elif waveform == Waveform.TRIANGLE:
-        return 2.0 * abs(2.0 * (phase / (2.0 * math.pi) - 0.5)) - 1.0
+        cycle -= 0.5
+        np.abs(cycle, out=cycle)
+        cycle *= 4.0
+        cycle -= 1.0
+        return cycle
     elif waveform == Waveform.SQUARE:
-        return 1.0 if phase < math.pi else -1.0
+        return np.where(cycle < 0.5, np.float32(1.0), np.float32(-1.0))
     elif waveform == Waveform.SAW:
-        return 2.0 * (phase / (2.0 * math.pi)) - 1.0
-    return 0.0
+        cycle *= 2.0
+        cycle -= 1.0
+        return cycle
+    return np.zeros_like(cycle)
 
 
-def apply_envelope(samples: List[float], env, sample_rate: int, duration: float) -> List[float]:
+def apply_envelope(samples: np.ndarray, env, sample_rate: int, duration: float) -> np.ndarray:
     """Apply envelope to samples."""
-    num_samples = len(samples)
-    result = samples[:]
-    
-    for i in range(num_samples):
-        t = i / sample_rate
-        amp = 1.0
-        
-        if env.shape == EnvelopeShape.EXP:
-            # Exponential attack and decay
-            if t < env.attack:
-                amp = t / env.attack
-            amp *= math.exp(-t / env.decay)
-        elif env.shape == EnvelopeShape.LIN:
-            # Linear attack and decay
-            if t < env.attack:
-                amp = t / env.attack
-            else:
-                decay_t = t - env.attack
-                amp = max(0.0, 1.0 - decay_t / env.decay)
-        elif env.shape == EnvelopeShape.ADSR:
-            # ADSR envelope
-            sustain_level = env.sustain if env.sustain is not None else 0.5
-            release_time = env.release if env.release is not None else 0.1
-            release_start = duration - release_time
-            
-            if t < env.attack:
-                amp = t / env.attack
-            elif t < env.attack + env.decay:
-                decay_t = t - env.attack
-                amp = 1.0 - (1.0 - sustain_level) * (decay_t / env.decay)
-            elif t < release_start:
-                amp = sustain_level
-            else:
-                release_t = t - release_start
-                amp = sustain_level * (1.0 - release_t / release_time)
+    t = np.arange(len(samples), dtype=np.float32) / sample_rate
+    # Attack ramp, 1.0 once the attack is over
+    if env.attack > 0:
+        ramp = np.minimum(t / env.attack, 1.0)
+    else:
+        ramp = np.ones_like(t)
+    
+    if env.shape == EnvelopeShape.EXP:
+        # Exponential attack and decay
+        amp = ramp * np.exp(-t / env.decay)
+    elif env.shape == EnvelopeShape.LIN:
+        # Linear attack and decay
+        amp = np.where(t < env.attack, ramp, 1.0 - (t - env.attack) / env.decay)
+    elif env.shape == EnvelopeShape.ADSR:
+        # ADSR envelope
+        sustain_level = env.sustain if env.sustain is not None else 0.5
+        release_time = env.release if env.release is not None else 0.1
+        release_start = duration - release_time
         
-        result[i] *= max(0.0, amp)
+        # A zero release is never reached; ignore its division by zero
+        with np.errstate(divide='ignore', invalid='ignore'):
+            amp = np.select(
+                [t < env.attack, t < env.attack + env.decay, t < release_start],
+                [
+                    ramp,
+                    1.0 - (1.0 - sustain_level) * ((t - env.attack) / env.decay),
+                    np.float32(sustain_level),
+                ],
+                sustain_level * (1.0 - (t - release_start) / release_time),
+            )
+    else:
+        amp = np.ones_like(t)
     
-    return result
+    return samples * np.maximum(amp, 0.0)
 
 
-def apply_modulation(samples: List[float], mod, sample_rate: int) -> List[float]:
+def apply_modulation(samples: np.ndarray, mod, sample_rate: int) -> np.ndarray:
     """Apply modulation (tremolo, pitch LFO)."""
-    result = samples[:]
+    result = samples
     
-    for i in range(len(samples)):
-        t = i / sample_rate
-        amp_mod = 1.0
-        
-        # Tremolo (amplitude modulation)
-        if mod.tremolo_hz > 0:
-            tremolo = math.sin(2.0 * math.pi * mod.tremolo_hz * t)
-            amp_mod *= 1.0 - mod.tremolo_depth * (tremolo + 1.0) / 2.0
-        
-        result[i] *= amp_mod
+    # Tremolo (amplitude modulation)
+    if mod.tremolo_hz > 0 and mod.tremolo_depth > 0:
+        t = np.arange(len(samples), dtype=np.float32) / sample_rate
+        tremolo = np.sin(_TWO_PI * mod.tremolo_hz * t)
+        result = samples * (1.0 - mod.tremolo_depth * (tremolo + 1.0) / 2.0)
     
     # Note: pitch_lfo would require phase modulation during synthesis
     # For simplicity, we skip it here (would need refactoring)
@@ -302,7 +392,7 @@ def apply_modulation(samples: List[float], mod, sample_rate: int) -> List[float]
     return result
 
 
-def apply_filter(samples: List[float], filt: Filter, sample_rate: int) -> List[float]:
+def apply_filter(samples: np.ndarray, filt: Filter, sample_rate: int) -> np.ndarray:
     """Apply filter to samples."""
     if filt.type == FilterType.LP1:
         return apply_onepole_lp(samples, filt, sample_rate)
@@ -312,135 +402,154 @@ def apply_filter(samples: List[float], filt: Filter, sample_rate: int) -> List[f
         return apply_biquad(samples, filt, sample_rate)
 
 
-def apply_onepole_lp(samples: List[float], filt: Filter, sample_rate: int) -> List[float]:
+def apply_onepole_lp(samples: np.ndarray, filt: Filter, sample_rate: int) -> np.ndarray:
     """Apply one-pole lowpass filter."""
-    result = [0.0] * len(samples)
-    y_prev = 0.0
-    
-    for i in range(len(samples)):
-        # Calculate cutoff (with sweep if specified)
-        if filt.cutoff_end is not None:
-            t = i / len(samples)
-            if filt.curve == Curve.LINEAR:
-                cutoff = filt.cutoff + (filt.cutoff_end - filt.cutoff) * t
-            else:
-                ratio = filt.cutoff_end / filt.cutoff
-                cutoff = filt.cutoff * (ratio ** t)
-        else:
-            cutoff = filt.cutoff
-        
-        # One-pole coefficient
-        rc = 1.0 / (2.0 * math.pi * cutoff)
-        dt = 1.0 / sample_rate
-        alpha = dt / (rc + dt)
-        
-        y = alpha * samples[i] + (1.0 - alpha) * y_prev
-        result[i] = y
-        y_prev = y
-    
-    return result
+    rc = 1.0 / (_TWO_PI * _cutoff_curve(filt, len(samples)))
+    dt = 1.0 / sample_rate
+    alpha = dt / (rc + dt)
+    if filt.cutoff_end is None:
+        return _onepole_lp_kernel(_kernel_input(samples), float(alpha))
+    return _onepole_lp_sweep_kernel(_kernel_input(samples), _kernel_input(alpha))
 
 
-def apply_onepole_hp(samples: List[float], filt: Filter, sample_rate: int) -> List[float]:
+def apply_onepole_hp(samples: np.ndarray, filt: Filter, sample_rate: int) -> np.ndarray:
     """Apply one-pole highpass filter."""
-    result = [0.0] * len(samples)
-    y_prev = 0.0
-    x_prev = 0.0
-    
-    for i in range(len(samples)):
-        if filt.cutoff_end is not None:
-            t = i / len(samples)
-            if filt.curve == Curve.LINEAR:
-                cutoff = filt.cutoff + (filt.cutoff_end - filt.cutoff) * t
-            else:
-                ratio = filt.cutoff_end / filt.cutoff
-                cutoff = filt.cutoff * (ratio ** t)
-        else:
-            cutoff = filt.cutoff
-        
-        rc = 1.0 / (2.0 * math.pi * cutoff)
-        dt = 1.0 / sample_rate
-        alpha = rc / (rc + dt)
-        
-        y = alpha * (y_prev + samples[i] - x_prev)
-        result[i] = y
-        y_prev = y
-        x_prev = samples[i]
-    
-    return result
+    rc = 1.0 / (_TWO_PI * _cutoff_curve(filt, len(samples)))
+    dt = 1.0 / sample_rate
+    alpha = rc / (rc + dt)
+    if filt.cutoff_end is None:
+        return _onepole_hp_kernel(_kernel_input(samples), float(alpha))
+    return _onepole_hp_sweep_kernel(_kernel_input(samples), _kernel_input(alpha))
 
 
-def apply_biquad(samples: List[float], filt: Filter, sample_rate: int) -> List[float]:
+def apply_biquad(samples: np.ndarray, filt: Filter, sample_rate: int) -> np.ndarray:
     """Apply biquad filter (RBJ cookbook)."""
-    result = [0.0] * len(samples)
+    coeffs = _biquad_coefficients(filt.type, _cutoff_curve(filt, len(samples)), filt.q, sample_rate)
+    if filt.cutoff_end is None:
+        return _biquad_kernel(_kernel_input(samples), *(float(c) for c in coeffs))
+    return _biquad_sweep_kernel(_kernel_input(samples), *(_kernel_input(c) for c in coeffs))
+
+
+def _cutoff_curve(filt: Filter, num_samples: int):
+    """
+    Get the cutoff for every sample, following the sweep if there is one.
+    
+    A fixed cutoff is returned as a scalar, so filter coefficients are only
+    computed once.
+    """
+    if filt.cutoff_end is None:
+        return float(filt.cutoff)
+    t = np.arange(num_samples) / num_samples
+    if filt.curve == Curve.LINEAR:
+        return filt.cutoff + (filt.cutoff_end - filt.cutoff) * t
+    ratio = filt.cutoff_end / filt.cutoff
+    return filt.cutoff * (ratio ** t)
+
+
+def _biquad_coefficients(filter_type: FilterType, cutoff, q: float, sample_rate: int):
+    """Get biquad coefficients (b0, b1, b2, a1, a2), normalized by a0, for a scalar or per-sample cutoff."""
+    w0 = _TWO_PI * cutoff / sample_rate
+    cos_w0 = np.cos(w0)
+    sin_w0 = np.sin(w0)
+    alpha = sin_w0 / (2.0 * q)
+    
+    if filter_type == FilterType.BIQUAD_LP:
+        b0 = (1.0 - cos_w0) / 2.0
+        b1 = 1.0 - cos_w0
+        b2 = (1.0 - cos_w0) / 2.0
+    elif filter_type == FilterType.BIQUAD_HP:
+        b0 = (1.0 + cos_w0) / 2.0
+        b1 = -(1.0 + cos_w0)
+        b2 = (1.0 + cos_w0) / 2.0
+    elif filter_type == FilterType.BIQUAD_BP:
+        b0 = alpha
+        b1 = np.zeros_like(alpha)
+        b2 = -alpha
+    else:  # NOTCH
+        b0 = np.ones_like(cos_w0)
+        b1 = -2.0 * cos_w0
+        b2 = np.ones_like(cos_w0)
+    a0 = 1.0 + alpha
+    a1 = -2.0 * cos_w0
+    a2 = 1.0 - alpha
+    
+    return b0 / a0, b1 / a0, b2 / a0, a1 / a0, a2 / a0
+
+
+@njit(cache=True, nogil=True)
+def _onepole_lp_kernel(x, alpha):
+    out = np.empty(len(x), dtype=np.float32)
+    y = 0.0
+    for i in range(len(x)):
+        y = alpha * x[i] + (1.0 - alpha) * y
+        out[i] = y
+    return out
+
+
+@njit(cache=True, nogil=True)
+def _onepole_lp_sweep_kernel(x, alpha):
+    out = np.empty(len(x), dtype=np.float32)
+    y = 0.0
+    for i in range(len(x)):
+        y = alpha[i] * x[i] + (1.0 - alpha[i]) * y
+        out[i] = y
+    return out
+
+
+@njit(cache=True, nogil=True)
+def _onepole_hp_kernel(x, alpha):
+    out = np.empty(len(x), dtype=np.float32)
+    y = 0.0
+    x_prev = 0.0
+    for i in range(len(x)):
+        y = alpha * (y + x[i] - x_prev)
+        out[i] = y
+        x_prev = x[i]
+    return out
+
+
+@njit(cache=True, nogil=True)
+def _onepole_hp_sweep_kernel(x, alpha):
+    out = np.empty(len(x), dtype=np.float32)
+    y = 0.0
+    x_prev = 0.0
+    for i in range(len(x)):
+        y = alpha[i] * (y + x[i] - x_prev)
+        out[i] = y
+        x_prev = x[i]
+    return out
+
+
+@njit(cache=True, nogil=True)
+def _biquad_kernel(x, b0, b1, b2, a1, a2):
+    # Transposed direct form II: two state registers
+    out = np.empty(len(x), dtype=np.float32)
+    s1 = s2 = 0.0
+    for i in range(len(x)):
+        y = b0 * x[i] + s1
+        s1 = b1 * x[i] - a1 * y + s2
+        s2 = b2 * x[i] - a2 * y
+        out[i] = y
+    return out
+
+
+@njit(cache=True, nogil=True)
+def _biquad_sweep_kernel(x, b0, b1, b2, a1, a2):
+    # Direct form I: its state is past inputs/outputs, so it stays well
+    # behaved when the coefficients change every sample
+    out = np.empty(len(x), dtype=np.float32)
     x1 = x2 = y1 = y2 = 0.0
-    
-    for i in range(len(samples)):
-        if filt.cutoff_end is not None:
-            t = i / len(samples)
-            if filt.curve == Curve.LINEAR:
-                cutoff = filt.cutoff + (filt.cutoff_end - filt.cutoff) * t
-            else:
-                ratio = filt.cutoff_end / filt.cutoff
-                cutoff = filt.cutoff * (ratio ** t)
-        else:
-            cutoff = filt.cutoff
-        
-        # Calculate biquad coefficients
-        w0 = 2.0 * math.pi * cutoff / sample_rate
-        cos_w0 = math.cos(w0)
-        sin_w0 = math.sin(w0)
-        alpha = sin_w0 / (2.0 * filt.q)
-        
-        if filt.type == FilterType.BIQUAD_LP:
-            b0 = (1.0 - cos_w0) / 2.0
-            b1 = 1.0 - cos_w0
-            b2 = (1.0 - cos_w0) / 2.0
-            a0 = 1.0 + alpha
-            a1 = -2.0 * cos_w0
-            a2 = 1.0 - alpha
-        elif filt.type == FilterType.BIQUAD_HP:
-            b0 = (1.0 + cos_w0) / 2.0
-            b1 = -(1.0 + cos_w0)
-            b2 = (1.0 + cos_w0) / 2.0
-            a0 = 1.0 + alpha
-            a1 = -2.0 * cos_w0
-            a2 = 1.0 - alpha
-        elif filt.type == FilterType.BIQUAD_BP:
-            b0 = alpha
-            b1 = 0.0
-            b2 = -alpha
-            a0 = 1.0 + alpha
-            a1 = -2.0 * cos_w0
-            a2 = 1.0 - alpha
-        else:  # NOTCH
-            b0 = 1.0
-            b1 = -2.0 * cos_w0
-            b2 = 1.0
-            a0 = 1.0 + alpha
-            a1 = -2.0 * cos_w0
-            a2 = 1.0 - alpha
-        
-        # Normalize
-        b0 /= a0
-        b1 /= a0
-        b2 /= a0
-        a1 /= a0
-        a2 /= a0
-        
-        # Apply filter
-        y = b0 * samples[i] + b1 * x1 + b2 * x2 - a1 * y1 - a2 * y2
-        result[i] = y
-        
+    for i in range(len(x)):
+        y = b0[i] * x[i] + b1[i] * x1 + b2[i] * x2 - a1[i] * y1 - a2[i] * y2
+        out[i] = y
         x2 = x1
-        x1 = samples[i]
+        x1 = x[i]
         y2 = y1
         y1 = y
-    
-    return result
+    return out
 
 
-def apply_fx(samples: List[float], fx, sample_rate: int) -> List[float]:
+def apply_fx(samples: np.ndarray, fx, sample_rate: int) -> np.ndarray:
     """Apply an effect."""
     if fx.type == FXType.SOFTCLIP:
         return apply_softclip(samples, fx.params.drive)
@@ -448,68 +557,63 @@ def apply_fx(samples: List[float], fx, sample_rate: int) -> List[float]:
         return apply_bitcrush(samples, fx.params.steps, fx.params.hold_samples)
     elif fx.type == FXType.DELAY:
         return apply_delay(samples, fx.params.time_ms, fx.params.feedback, fx.params.mix, sample_rate)
-    elif fx.type == FXType.NORMALIZE:
+    elif fx.type == FXType.NORMALIZE and fx.params.target_peak is not None:
         return normalize_samples(samples, fx.params.target_peak)
     return samples
 
 
-def apply_softclip(samples: List[float], drive: float) -> List[float]:
+def apply_softclip(samples: np.ndarray, drive: float) -> np.ndarray:
     """Apply soft clipping distortion."""
-    result = []
-    for s in samples:
-        x = s * drive
-        result.append(softclip(x))
-    return result
+    return softclip(samples * drive)
 
 
-def softclip(x: float) -> float:
-    """Soft clipping function."""
-    if x > 1.0:
-        return 1.0
-    elif x < -1.0:
-        return -1.0
-    else:
-        return x - (x ** 3) / 3.0
+def softclip(x: np.ndarray) -> np.ndarray:
+    """Soft clipping function: cubic within [-1, 1], limited to +/-1 beyond."""
+    return np.where(np.abs(x) > 1.0, np.sign(x), x - (x * x * x) / 3.0)
 
 
-def apply_bitcrush(samples: List[float], steps: int, hold_samples: int) -> List[float]:
+def apply_bitcrush(samples: np.ndarray, steps: int, hold_samples: int) -> np.ndarray:
     """Apply bitcrusher effect."""
-    result = []
-    held_value = 0.0
-    
-    for i, s in enumerate(samples):
-        if i % hold_samples == 0:
-            # Quantize
-            if steps > 0:
-                quantized = round(s * steps) / steps
-            else:
-                quantized = s
-            held_value = quantized
-        result.append(held_value)
-    
-    return result
+    # Sample every hold_samples-th value and hold it until the next one
+    held = samples[::hold_samples]
+    if steps > 0:
+        # Quantize
+        held = np.round(held * steps) / steps
+    return np.repeat(held, hold_samples)[:len(samples)]
 
 
-def apply_delay(samples: List[float], time_ms: float, feedback: float, mix: float, sample_rate: int) -> List[float]:
+def apply_delay(samples: np.ndarray, time_ms: float, feedback: float, mix: float, sample_rate: int) -> np.ndarray:
     """Apply delay effect."""
+    if mix == 0.0:
+        # The echoes are never mixed in, whatever the feedback
+        return samples.copy()
     delay_samples = int(time_ms * sample_rate / 1000.0)
-    buffer = [0.0] * delay_samples
-    result = []
-    
-    for s in samples:
-        delayed = buffer[0]
-        output = s + delayed * mix
-        buffer.append(s + delayed * feedback)
-        buffer.pop(0)
-        result.append(output)
-    
-    return result
-
-
-def normalize_samples(samples: List[float], target_peak: float) -> List[float]:
+    if delay_samples <= 0:
+        # Slider updates are not re-validated, so a zero delay can reach here;
+        # the kernel's ring buffer needs at least one slot
+        return samples.copy()
+    return _delay_kernel(_kernel_input(samples), delay_samples, feedback, mix)
+
+
+@njit(cache=True, nogil=True)
+def _delay_kernel(x, delay_samples, feedback, mix):
+    out = np.empty(len(x), dtype=np.float32)
+    # Ring buffer; position w holds the sample written delay_samples ago
+    buf = np.zeros(delay_samples)
+    w = 0
+    for i in range(len(x)):
+        delayed = buf[w]
+        out[i] = x[i] + delayed * mix
+        buf[w] = x[i] + delayed * feedback
+        w += 1
+        if w == delay_samples:
+            w = 0
+    return out
+
+
+def normalize_samples(samples: np.ndarray, target_peak: float) -> np.ndarray:
     """Normalize samples to target peak."""
-    peak = max(abs(s) for s in samples)
+    peak = float(np.max(np.abs(samples), initial=0.0))
     if peak > 0.0:
-        gain = target_peak / peak
-        return [s * gain for s in samples]
+        return samples * np.float32(target_peak / peak)
     return samples
@@ -1,8 +1,10 @@
 """SoundSpec JSON schema and validation using Pydantic."""
 
+import functools
 from enum import Enum
-from typing import List, Optional, Union, Literal
-from pydantic import BaseModel, Field, field_validator, model_validator, ConfigDict
+from typing import Any, List, Optional, Union, Literal
+from pydantic import BaseModel, Field, PrivateAttr, field_validator, model_validator, ConfigDict
+import orjson
 
 
 class Waveform(str, Enum):
@@ -130,6 +132,16 @@ class ImpulseParams(BaseModel):
     tone_freq: Optional[float] = Field(default=None, ge=20.0, le=20000.0)
 
 
+# Layer type -> the params field that type requires
+_LAYER_PARAMS_FIELD = {
+    LayerType.OSC: 'osc',
+    LayerType.CHIRP: 'chirp',
+    LayerType.FM: 'fm',
+    LayerType.NOISE: 'noise',
+    LayerType.IMPULSE: 'impulse'
+}
+
+
 class Layer(BaseModel):
     id: str
     type: LayerType
@@ -149,14 +161,7 @@ class Layer(BaseModel):
 
     @model_validator(mode='after')
     def check_type_params(self):
-        type_map = {
-            LayerType.OSC: 'osc',
-            LayerType.CHIRP: 'chirp',
-            LayerType.FM: 'fm',
-            LayerType.NOISE: 'noise',
-            LayerType.IMPULSE: 'impulse'
-        }
-        required_field = type_map[self.type]
+        required_field = _LAYER_PARAMS_FIELD[self.type]
         if getattr(self, required_field) is None:
             raise ValueError(f"Layer type '{self.type}' requires '{required_field}' params")
         return self
@@ -215,6 +220,41 @@ class SoundSpec(BaseModel):
     fx_chain: List[FX] = Field(default_factory=list, max_length=8)
     params: List[Param] = Field(default_factory=list, max_length=24)
 
+    # Bumped by update_spec_from_param so callers can cache derived data
+    _revision: int = PrivateAttr(default=0)
+    # Lookup indexes as (source list, its length, index), rebuilt when stale
+    _layer_index: Optional[tuple] = PrivateAttr(default=None)
+    _fx_index: Optional[tuple] = PrivateAttr(default=None)
+
+    def __eq__(self, other: Any) -> bool:
+        # Private attributes are counters and caches, not part of the sound
+        if not isinstance(other, SoundSpec):
+            return NotImplemented
+        return self.__dict__ == other.__dict__
+
+    @property
+    def revision(self) -> int:
+        """Number of successful parameter updates applied to this spec."""
+        return self._revision
+
+    def layer_by_id(self, layer_id: str) -> Optional[Layer]:
+        """Look up a layer by id."""
+        index = self._layer_index
+        if index is None or index[0] is not self.layers or index[1] != len(self.layers):
+            index = (self.layers, len(self.layers), {layer.id: layer for layer in self.layers})
+            self._layer_index = index
+        return index[2].get(layer_id)
+
+    def fx_by_type(self, fx_type: str) -> Optional[FX]:
+        """Look up the first effect of a type in the chain."""
+        index = self._fx_index
+        if index is None or index[0] is not self.fx_chain or index[1] != len(self.fx_chain):
+            # Reversed so the first effect of each type wins
+            by_type = {fx.type.value: fx for fx in reversed(self.fx_chain)}
+            index = (self.fx_chain, len(self.fx_chain), by_type)
+            self._fx_index = index
+        return index[2].get(fx_type)
+
     @field_validator('layers')
     @classmethod
     def check_unique_layer_ids(cls, v):
@@ -234,4 +274,10 @@ class SoundSpec(BaseModel):
 
 def export_json_schema() -> dict:
     """Export the JSON schema for SoundSpec."""
-    return SoundSpec.model_json_schema()
+    # Kept serialized, so each caller gets its own copy to modify
+    return orjson.loads(_json_schema_bytes())
+
+
+@functools.lru_cache(maxsize=None)
+def _json_schema_bytes() -> bytes:
+    return orjson.dumps(SoundSpec.model_json_schema())
@@ -0,0 +1,153 @@
+"""Similarity cache for reusing SoundSpecs across near-duplicate prompts."""
+
+import os
+import re
+import zlib
+import threading
+from pathlib import Path
+from typing import Callable, Optional
+import numpy as np
+import orjson
+
+EMBEDDING_DIM = 384
+# Only identical sets of content-word stems score this high; a lexical match
+# cannot tell "short laser" from "long laser" by degree, so it must be exact
+DEFAULT_THRESHOLD = 0.999
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+# Versioned so embeddings saved by an older embed_text are not reloaded
+_EMBEDDINGS_FILE = "embeddings-v3.npy"
+_ENTRIES_FILE = "entries-v3.json"
+
+# Slots each stem is hashed into, so two different words almost never share
+# all of them and score as the same prompt
+_HASHES_PER_STEM = 3
+
+# Words that say nothing about which sound is wanted
+_STOP_WORDS = frozenset({
+    "a", "an", "and", "for", "like", "of", "some", "the", "very", "with",
+    "effect", "effects", "sfx", "sound", "sounds",
+})
+
+# Inflection suffix -> replacement, tried in order; the first match wins
+_SUFFIXES = (
+    ("ings", ""), ("ing", ""), ("ical", "ic"), ("ies", "y"), ("ied", "y"),
+    ("ed", ""), ("es", ""), ("s", ""), ("y", ""),
+)
+
+
+def default_cache_dir() -> Path:
+    """Get the on-disk cache directory (override with SOUNDFORGE_CACHE_DIR)."""
+    return Path(os.environ.get("SOUNDFORGE_CACHE_DIR", "~/.cache/soundforge")).expanduser()
+
+
+def stem_word(word: str) -> str:
+    """Crudely strip inflections so "zappy", "zaps" and "zapping" all give "zap"."""
+    for suffix, replacement in _SUFFIXES:
+        if word.endswith(suffix) and len(word) - len(suffix) >= 3:
+            word = word[:-len(suffix)] + replacement
+            break
+    # Undo consonant doubling ("zapp") and a silent final e ("chime")
+    if len(word) > 3 and word[-1] == word[-2] and word[-1] not in "aeiou":
+        word = word[:-1]
+    if len(word) > 3 and word.endswith("e"):
+        word = word[:-1]
+    return word
+
+
+def embed_text(text: str) -> np.ndarray:
+    """
+    Embed text as a unit-length set of hashed content-word stems.
+
+    This is lexical, not semantic: prompts score 1.0 when they use the same
+    words in any order and inflection ("laser zap" / "zappy lasers"), with
+    filler such as "a ... sound effect" ignored. Any differing word, such as
+    an antonym ("short" / "long"), lowers the score below the default
+    threshold. Synonyms ("laser" / "pew pew") do not match.
+    """
+    vec = np.zeros(EMBEDDING_DIM, dtype=np.float32)
+    stems = {stem_word(word) for word in _TOKEN_RE.findall(text.lower()) if word not in _STOP_WORDS}
+    for stem in stems:
+        for seed in range(_HASHES_PER_STEM):
+            vec[zlib.crc32(f"{seed}:{stem}".encode()) % EMBEDDING_DIM] += 1.0
+    norm = float(np.linalg.norm(vec))
+    if norm > 0.0:
+        vec /= norm
+    return vec
+
+
+class SemanticCache:
+    """
+    Maps prompts to SoundSpec JSON by cosine similarity of prompt embeddings.
+
+    Entries are only matched against entries with the same style. When a path
+    is given the cache is loaded from and saved to that directory.
+    """
+
+    def __init__(
+        self,
+        path: Optional[Path] = None,
+        threshold: float = DEFAULT_THRESHOLD,
+        embed: Callable[[str], np.ndarray] = embed_text,
+        max_entries: int = 1024,
+    ):
+        self.path = Path(path) if path is not None else None
+        self.threshold = threshold
+        self.embed = embed
+        self.max_entries = max_entries
+        self._embeddings = np.empty((0, EMBEDDING_DIM), dtype=np.float32)
+        self._styles: list[str] = []
+        self._specs: list[str] = []
+        self._lock = threading.Lock()
+        if self.path is not None:
+            self._load()
+
+    def __len__(self) -> int:
+        return len(self._specs)
+
+    def lookup(self, prompt: str, style: Optional[str] = None) -> Optional[str]:
+        """Return the cached SoundSpec JSON for a similar prompt, if any."""
+        with self._lock:
+            if not self._specs:
+                return None
+            scores = self._embeddings @ self.embed(prompt)
+            scores[np.asarray(self._styles) != (style or "")] = -1.0
+            best = int(np.argmax(scores))
+            if scores[best] < self.threshold:
+                return None
+            return self._specs[best]
+
+    def add(self, prompt: str, style: Optional[str], spec_json: str) -> None:
+        """Store the SoundSpec JSON generated for a prompt."""
+        with self._lock:
+            embedding = self.embed(prompt)[np.newaxis, :]
+            self._embeddings = np.concatenate([self._embeddings, embedding])[-self.max_entries:]
+            self._styles = (self._styles + [style or ""])[-self.max_entries:]
+            self._specs = (self._specs + [spec_json])[-self.max_entries:]
+            if self.path is not None:
+                self._save()
+
+    def _load(self) -> None:
+        try:
+            embeddings = np.load(self.path / _EMBEDDINGS_FILE)
+            entries = orjson.loads((self.path / _ENTRIES_FILE).read_bytes())
+        except (OSError, ValueError):
+            return
+        if embeddings.shape != (len(entries), EMBEDDING_DIM):
+            return
+        self._embeddings = embeddings.astype(np.float32)
+        self._styles = [entry["style"] for entry in entries]
+        self._specs = [entry["spec"] for entry in entries]
+
+    def _save(self) -> None:
+        try:
+            self.path.mkdir(parents=True, exist_ok=True)
+            np.save(self.path / _EMBEDDINGS_FILE, self._embeddings)
+            entries = [
+                {"style": style, "spec": spec}
+                for style, spec in zip(self._styles, self._specs)
+            ]
+            (self.path / _ENTRIES_FILE).write_bytes(orjson.dumps(entries))
+        except OSError:
+            pass
@@ -1,52 +1,43 @@
 """WAV file encoding utilities."""
 
 import struct
-import io
+from typing import Iterator
+import numpy as np
 
 
-def float_to_pcm16(samples: list[float]) -> bytes:
+def float_to_pcm16(samples: np.ndarray) -> bytes:
     """Convert float samples in [-1, 1] to 16-bit PCM."""
-    pcm_data = bytearray()
-    for sample in samples:
-        # Clamp to [-1, 1]
-        sample = max(-1.0, min(1.0, sample))
-        # Convert to 16-bit signed integer
-        pcm_value = int(sample * 32767)
-        pcm_data.extend(struct.pack('<h', pcm_value))
-    return bytes(pcm_data)
+    # Clamp to [-1, 1] into a new buffer, leaving the caller's samples intact
+    pcm = np.clip(np.asarray(samples, dtype=np.float32), -1.0, 1.0)
+    pcm *= 32767
+    # Convert to 16-bit signed integer (truncating toward zero)
+    return pcm.astype('<i2').tobytes()
 
 
-def encode_wav(samples: list[float], sample_rate: int) -> bytes:
-    """Encode float samples as WAV file bytes (mono, 16-bit PCM)."""
-    pcm_data = float_to_pcm16(samples)
-    num_samples = len(samples)
+def wav_header(num_samples: int, sample_rate: int) -> bytes:
+    """Build the 44-byte RIFF header for mono 16-bit PCM audio."""
     num_channels = 1
     bits_per_sample = 16
     byte_rate = sample_rate * num_channels * bits_per_sample // 8
     block_align = num_channels * bits_per_sample // 8
-    data_size = len(pcm_data)
-    
-    # Build WAV file
-    wav = io.BytesIO()
-    
-    # RIFF header
-    wav.write(b'RIFF')
-    wav.write(struct.pack('<I', 36 + data_size))
-    wav.write(b'WAVE')
-    
-    # fmt chunk
-    wav.write(b'fmt ')
-    wav.write(struct.pack('<I', 16))  # Chunk size
-    wav.write(struct.pack('<H', 1))   # Audio format (PCM)
-    wav.write(struct.pack('<H', num_channels))
-    wav.write(struct.pack('<I', sample_rate))
-    wav.write(struct.pack('<I', byte_rate))
-    wav.write(struct.pack('<H', block_align))
-    wav.write(struct.pack('<H', bits_per_sample))
-    
-    # data chunk
-    wav.write(b'data')
-    wav.write(struct.pack('<I', data_size))
-    wav.write(pcm_data)
+    data_size = num_samples * block_align
     
-    return wav.getvalue()
+    return struct.pack(
+        '<4sI4s4sIHHIIHH4sI',
+        b'RIFF', 36 + data_size, b'WAVE',
+        # fmt chunk: size, PCM format, channels, rate, byte rate, align, bits
+        b'fmt ', 16, 1, num_channels, sample_rate, byte_rate, block_align, bits_per_sample,
+        # data chunk header
+        b'data', data_size,
+    )
+
+
+def encode_wav(samples: np.ndarray, sample_rate: int) -> bytes:
+    """Encode float samples as WAV file bytes (mono, 16-bit PCM)."""
+    return wav_header(len(samples), sample_rate) + float_to_pcm16(samples)
+
+
+def encode_wav_chunks(samples: np.ndarray, chunk_size: int) -> Iterator[bytes]:
+    """Yield 16-bit PCM data for float samples in chunks of chunk_size samples."""
+    for start in range(0, len(samples), chunk_size):
+        yield float_to_pcm16(samples[start:start + chunk_size])
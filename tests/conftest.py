@@ -0,0 +1,54 @@
+"""Shared fixtures for the test suite."""
+
+import pytest
+from soundforge.renderer import render_samples
+from soundforge.schema import SoundSpec
+from tests.helpers import MIN_DURATION
+
+
+# Touches every compiled kernel: sine osc, pink noise, fixed and swept
+# one-pole and biquad filters, and the delay line.
+WARMUP_SPEC = {
+    "version": "soundspec-1",
+    "name": "warmup",
+    "description": "warmup",
+    "sample_rate": 44100,
+    "duration": MIN_DURATION,
+    "seed": 1,
+    "global": {"amp": 0.8, "normalize": False},
+    "layers": [
+        {
+            "id": "tone",
+            "type": "osc",
+            "amp": 0.5,
+            "env": {"attack": 0.001, "decay": 0.02},
+            "filter": [
+                {"type": "lp1", "cutoff": 4000.0},
+                {"type": "hp1", "cutoff": 100.0, "cutoff_end": 200.0},
+                {"type": "biquad_lp", "cutoff": 3000.0},
+                {"type": "biquad_hp", "cutoff": 80.0, "cutoff_end": 160.0}
+            ],
+            "osc": {"waveform": "sine", "freq": 440.0}
+        },
+        {
+            "id": "hiss",
+            "type": "noise",
+            "amp": 0.5,
+            "env": {"attack": 0.001, "decay": 0.02},
+            "filter": [
+                {"type": "hp1", "cutoff": 300.0},
+                {"type": "lp1", "cutoff": 6000.0, "cutoff_end": 3000.0}
+            ],
+            "noise": {"color": "pink"}
+        }
+    ],
+    "fx_chain": [
+        {"type": "delay", "params": {"time_ms": 10.0, "feedback": 0.3, "mix": 0.2}}
+    ]
+}
+
+
+@pytest.fixture(autouse=True, scope="session")
+def _warm_renderer():
+    """Render a tiny spec first so kernel loading is not charged to one test."""
+    render_samples(SoundSpec.model_validate(WARMUP_SPEC))
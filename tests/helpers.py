@@ -0,0 +1,16 @@
+"""Constants and helpers shared by test modules."""
+
+import hashlib
+
+import numpy as np
+
+
+# Shortest duration the schema accepts. Determinism checks compare every
+# sample, so a few hundred frames exercise the same code paths as a full clip.
+MIN_DURATION = 0.03
+
+
+def digest(samples) -> bytes:
+    """Return a short content hash of a sample buffer as float32 bytes."""
+    data = np.ascontiguousarray(samples, dtype=np.float32)
+    return hashlib.blake2b(data, digest_size=16).digest()
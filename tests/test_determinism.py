@@ -1,100 +1,202 @@
 """Tests for deterministic rendering."""
 
+import numpy as np
 import pytest
+from concurrent.futures import ThreadPoolExecutor
 from soundforge.schema import SoundSpec
-from soundforge.renderer import render_samples, render_wav_bytes
+from soundforge import renderer
+from soundforge.presets import get_default_pickup
+from soundforge.renderer import render_samples, render_wav_bytes, render_wav_bytes_cached, render_wav_chunks
+from tests.helpers import MIN_DURATION, digest
 
 
-def test_deterministic_rendering():
-    """Test that same spec produces identical samples."""
-    spec_dict = {
-        "version": "soundspec-1",
-        "name": "test",
-        "description": "test",
-        "sample_rate": 44100,
-        "duration": 0.1,
-        "seed": 42,
-        "global": {"amp": 0.8, "normalize": False},
-        "layers": [
-            {
-                "id": "main",
-                "type": "osc",
-                "amp": 0.7,
-                "pan": 0.0,
-                "phase": 0.0,
-                "env": {"attack": 0.01, "decay": 0.08, "shape": "exp"},
-                "osc": {"waveform": "sine", "freq": 440.0, "detune": 0.0}
+OSC_SPEC = {
+    "version": "soundspec-1",
+    "name": "test",
+    "description": "test",
+    "sample_rate": 44100,
+    "duration": MIN_DURATION,
+    "seed": 42,
+    "global": {"amp": 0.8, "normalize": False},
+    "layers": [
+        {
+            "id": "main",
+            "type": "osc",
+            "amp": 0.7,
+            "pan": 0.0,
+            "phase": 0.0,
+            "env": {"attack": 0.01, "decay": 0.08, "shape": "exp"},
+            "osc": {"waveform": "sine", "freq": 440.0, "detune": 0.0}
+        }
+    ]
+}
+
+NOISE_SPEC = {
+    "version": "soundspec-1",
+    "name": "test",
+    "description": "test",
+    "sample_rate": 44100,
+    "duration": MIN_DURATION,
+    "seed": 123,
+    "global": {"amp": 0.8, "normalize": False},
+    "layers": [
+        {
+            "id": "noise",
+            "type": "noise",
+            "amp": 0.6,
+            "pan": 0.0,
+            "phase": 0.0,
+            "env": {"attack": 0.001, "decay": 0.08, "shape": "exp"},
+            "noise": {"color": "white"}
+        }
+    ]
+}
+
+CHIRP_SPEC = {
+    "version": "soundspec-1",
+    "name": "test",
+    "description": "test",
+    "sample_rate": 44100,
+    "duration": MIN_DURATION,
+    "seed": 42,
+    "global": {"amp": 0.8, "normalize": False},
+    "layers": [
+        {
+            "id": "chirp",
+            "type": "chirp",
+            "amp": 0.8,
+            "pan": 0.0,
+            "phase": 0.0,
+            "env": {"attack": 0.01, "decay": 0.15, "shape": "exp"},
+            "chirp": {
+                "waveform": "saw",
+                "f_start": 1000.0,
+                "f_end": 200.0,
+                "curve": "exponential",
+                "vibrato_hz": 0.0,
+                "vibrato_depth": 0.0
             }
-        ]
-    }
-    
+        }
+    ]
+}
+
+FM_SPEC = {
+    "version": "soundspec-1",
+    "name": "test",
+    "description": "test",
+    "sample_rate": 44100,
+    "duration": MIN_DURATION,
+    "seed": 42,
+    "global": {"amp": 0.8, "normalize": False},
+    "layers": [
+        {
+            "id": "fm",
+            "type": "fm",
+            "amp": 0.7,
+            "pan": 0.0,
+            "phase": 0.0,
+            "env": {"attack": 0.01, "decay": 0.08, "shape": "exp"},
+            "fm": {
+                "carrier_freq": 440.0,
+                "mod_freq": 220.0,
+                "index": 5.0,
+                "brightness": 0.5
+            }
+        }
+    ]
+}
+
+NORMALIZE_SPEC = {
+    "version": "soundspec-1",
+    "name": "test",
+    "description": "test",
+    "sample_rate": 44100,
+    "duration": MIN_DURATION,
+    "seed": 42,
+    "global": {"amp": 0.8, "normalize": True},
+    "layers": [
+        {
+            "id": "main",
+            "type": "osc",
+            "amp": 0.7,
+            "pan": 0.0,
+            "phase": 0.0,
+            "env": {"attack": 0.01, "decay": 0.08, "shape": "exp"},
+            "osc": {"waveform": "sine", "freq": 440.0, "detune": 0.0}
+        }
+    ]
+}
+
+FX_SPEC = {
+    "version": "soundspec-1",
+    "name": "test",
+    "description": "test",
+    "sample_rate": 44100,
+    "duration": MIN_DURATION,
+    "seed": 42,
+    "global": {"amp": 0.8, "normalize": False},
+    "layers": [
+        {
+            "id": "main",
+            "type": "osc",
+            "amp": 0.7,
+            "pan": 0.0,
+            "phase": 0.0,
+            "env": {"attack": 0.01, "decay": 0.08, "shape": "exp"},
+            "osc": {"waveform": "sine", "freq": 440.0, "detune": 0.0}
+        }
+    ],
+    "fx_chain": [
+        {
+            "type": "softclip",
+            "enabled": True,
+            "params": {"drive": 2.0}
+        },
+        {
+            "type": "delay",
+            "enabled": True,
+            "params": {"time_ms": 10.0, "feedback": 0.3, "mix": 0.2}
+        }
+    ]
+}
+
+DETERMINISM_CASES = [
+    pytest.param(OSC_SPEC, id="osc"),
+    pytest.param(NOISE_SPEC, id="noise"),
+    pytest.param(CHIRP_SPEC, id="chirp"),
+    pytest.param(FM_SPEC, id="fm"),
+    pytest.param(NORMALIZE_SPEC, id="normalize"),
+    pytest.param(FX_SPEC, id="fx"),
+]
+
+
+@pytest.mark.parametrize("spec_dict", DETERMINISM_CASES)
+def test_deterministic_rendering(spec_dict):
+    """Test that same spec produces identical samples."""
     spec = SoundSpec.model_validate(spec_dict)
     
-    # Render twice
+    # Render twice from the same spec
     samples1 = render_samples(spec)
     samples2 = render_samples(spec)
     
-    # Should be identical
-    assert len(samples1) == len(samples2)
-    assert samples1 == samples2
+    assert samples1.dtype == samples2.dtype
+    assert np.array_equal(samples1, samples2)
 
 
-def test_deterministic_noise():
-    """Test that noise is deterministic with same seed."""
-    spec_dict = {
-        "version": "soundspec-1",
-        "name": "test",
-        "description": "test",
-        "sample_rate": 44100,
-        "duration": 0.1,
-        "seed": 123,
-        "global": {"amp": 0.8, "normalize": False},
-        "layers": [
-            {
-                "id": "noise",
-                "type": "noise",
-                "amp": 0.6,
-                "pan": 0.0,
-                "phase": 0.0,
-                "env": {"attack": 0.001, "decay": 0.08, "shape": "exp"},
-                "noise": {"color": "white"}
-            }
-        ]
-    }
-    
-    spec = SoundSpec.model_validate(spec_dict)
+def test_render_samples_returns_float32_array():
+    """Test that renders come back as a flat float32 array, not a list."""
+    spec = SoundSpec.model_validate(OSC_SPEC)
+    samples = render_samples(spec)
     
-    samples1 = render_samples(spec)
-    samples2 = render_samples(spec)
-    
-    assert samples1 == samples2
+    assert isinstance(samples, np.ndarray)
+    assert samples.dtype == np.float32
+    assert samples.shape == (int(spec.duration * spec.sample_rate),)
 
 
 def test_different_seeds_produce_different_noise():
     """Test that different seeds produce different noise."""
-    spec_dict1 = {
-        "version": "soundspec-1",
-        "name": "test",
-        "description": "test",
-        "sample_rate": 44100,
-        "duration": 0.1,
-        "seed": 42,
-        "global": {"amp": 0.8, "normalize": False},
-        "layers": [
-            {
-                "id": "noise",
-                "type": "noise",
-                "amp": 0.6,
-                "pan": 0.0,
-                "phase": 0.0,
-                "env": {"attack": 0.001, "decay": 0.08, "shape": "exp"},
-                "noise": {"color": "white"}
-            }
-        ]
-    }
-    
-    spec_dict2 = spec_dict1.copy()
-    spec_dict2["seed"] = 999
+    spec_dict1 = {**NOISE_SPEC, "seed": 42}
+    spec_dict2 = {**NOISE_SPEC, "seed": 999}
     
     spec1 = SoundSpec.model_validate(spec_dict1)
     spec2 = SoundSpec.model_validate(spec_dict2)
@@ -103,33 +205,12 @@ def test_different_seeds_produce_different_noise():
     samples2 = render_samples(spec2)
     
     # Should be different
-    assert samples1 != samples2
+    assert digest(samples1) != digest(samples2)
 
 
 def test_wav_bytes_deterministic():
     """Test that WAV encoding is deterministic."""
-    spec_dict = {
-        "version": "soundspec-1",
-        "name": "test",
-        "description": "test",
-        "sample_rate": 44100,
-        "duration": 0.1,
-        "seed": 42,
-        "global": {"amp": 0.8, "normalize": False},
-        "layers": [
-            {
-                "id": "main",
-                "type": "osc",
-                "amp": 0.7,
-                "pan": 0.0,
-                "phase": 0.0,
-                "env": {"attack": 0.01, "decay": 0.08, "shape": "exp"},
-                "osc": {"waveform": "sine", "freq": 440.0, "detune": 0.0}
-            }
-        ]
-    }
-    
-    spec = SoundSpec.model_validate(spec_dict)
+    spec = SoundSpec.model_validate(OSC_SPEC)
     
     wav1 = render_wav_bytes(spec)
     wav2 = render_wav_bytes(spec)
@@ -137,88 +218,14 @@ def test_wav_bytes_deterministic():
     assert wav1 == wav2
 
 
-def test_chirp_deterministic():
-    """Test that chirp rendering is deterministic."""
-    spec_dict = {
-        "version": "soundspec-1",
-        "name": "test",
-        "description": "test",
-        "sample_rate": 44100,
-        "duration": 0.2,
-        "seed": 42,
-        "global": {"amp": 0.8, "normalize": False},
-        "layers": [
-            {
-                "id": "chirp",
-                "type": "chirp",
-                "amp": 0.8,
-                "pan": 0.0,
-                "phase": 0.0,
-                "env": {"attack": 0.01, "decay": 0.15, "shape": "exp"},
-                "chirp": {
-                    "waveform": "saw",
-                    "f_start": 1000.0,
-                    "f_end": 200.0,
-                    "curve": "exponential",
-                    "vibrato_hz": 0.0,
-                    "vibrato_depth": 0.0
-                }
-            }
-        ]
-    }
-    
-    spec = SoundSpec.model_validate(spec_dict)
-    
-    samples1 = render_samples(spec)
-    samples2 = render_samples(spec)
-    
-    assert samples1 == samples2
-
-
-def test_fm_deterministic():
-    """Test that FM synthesis is deterministic."""
-    spec_dict = {
-        "version": "soundspec-1",
-        "name": "test",
-        "description": "test",
-        "sample_rate": 44100,
-        "duration": 0.1,
-        "seed": 42,
-        "global": {"amp": 0.8, "normalize": False},
-        "layers": [
-            {
-                "id": "fm",
-                "type": "fm",
-                "amp": 0.7,
-                "pan": 0.0,
-                "phase": 0.0,
-                "env": {"attack": 0.01, "decay": 0.08, "shape": "exp"},
-                "fm": {
-                    "carrier_freq": 440.0,
-                    "mod_freq": 220.0,
-                    "index": 5.0,
-                    "brightness": 0.5
-                }
-            }
-        ]
-    }
-    
-    spec = SoundSpec.model_validate(spec_dict)
-    
-    samples1 = render_samples(spec)
-    samples2 = render_samples(spec)
-    
-    assert samples1 == samples2
-
-
-def test_normalize_deterministic():
-    """Test that normalization is deterministic."""
+def test_wav_chunks_match_wav_bytes():
+    """Test that chunked WAV output joins to the same bytes."""
     spec_dict = {
         "version": "soundspec-1",
         "name": "test",
         "description": "test",
         "sample_rate": 44100,
-        "duration": 0.1,
+        "duration": 0.25,
         "seed": 42,
         "global": {"amp": 0.8, "normalize": True},
         "layers": [
@@ -228,7 +235,7 @@ def test_normalize_deterministic():
                 "amp": 0.7,
                 "pan": 0.0,
                 "phase": 0.0,
-                "env": {"attack": 0.01, "decay": 0.08, "shape": "exp"},
+                "env": {"attack": 0.01, "decay": 0.2, "shape": "exp"},
                 "osc": {"waveform": "sine", "freq": 440.0, "detune": 0.0}
             }
         ]
@@ -236,50 +243,69 @@ def test_normalize_deterministic():
     
     spec = SoundSpec.model_validate(spec_dict)
     
-    samples1 = render_samples(spec)
-    samples2 = render_samples(spec)
+    chunks = list(render_wav_chunks(spec, chunk_ms=100))
     
-    assert samples1 == samples2
+    assert len(chunks[0]) == 44
+    assert len(chunks) == 1 + 3
+    assert b"".join(chunks) == render_wav_bytes(spec)
 
 
-def test_fx_deterministic():
-    """Test that effects are deterministic."""
-    spec_dict = {
+def test_cached_render_reuses_identical_specs():
+    """Test that cached renders match fresh ones and are keyed on spec content."""
+    renderer._render_wav_json.cache_clear()
+    spec = get_default_pickup()
+    
+    wav = render_wav_bytes_cached(spec)
+    assert wav == render_wav_bytes(spec)
+    assert render_wav_bytes_cached(get_default_pickup()) is wav
+    
+    spec.duration = 0.5
+    assert render_wav_bytes_cached(spec) != wav
+    assert renderer._render_wav_json.cache_info().hits == 1
+
+
+def test_concurrent_layers_match_sequential(monkeypatch):
+    """Test that rendering layers on threads gives the same samples as in order."""
+    spec = SoundSpec.model_validate({
         "version": "soundspec-1",
         "name": "test",
         "description": "test",
         "sample_rate": 44100,
-        "duration": 0.1,
+        "duration": MIN_DURATION,
         "seed": 42,
         "global": {"amp": 0.8, "normalize": False},
         "layers": [
             {
-                "id": "main",
-                "type": "osc",
-                "amp": 0.7,
-                "pan": 0.0,
-                "phase": 0.0,
-                "env": {"attack": 0.01, "decay": 0.08, "shape": "exp"},
-                "osc": {"waveform": "sine", "freq": 440.0, "detune": 0.0}
-            }
-        ],
-        "fx_chain": [
+                "id": "noise",
+                "type": "noise",
+                "amp": 0.5,
+                "env": {"attack": 0.0, "decay": 0.05},
+                "noise": {"color": "pink"}
+            },
             {
-                "type": "softclip",
-                "enabled": True,
-                "params": {"drive": 2.0}
+                "id": "tap",
+                "type": "impulse",
+                "amp": 0.5,
+                "env": {"attack": 0.0, "decay": 0.05},
+                "impulse": {"kind": "tap", "width": 0.005}
             },
             {
-                "type": "delay",
-                "enabled": True,
-                "params": {"time_ms": 50.0, "feedback": 0.3, "mix": 0.2}
+                "id": "tone",
+                "type": "osc",
+                "amp": 0.5,
+                "env": {"attack": 0.01, "decay": 0.08},
+                "osc": {"waveform": "saw", "freq": 220.0}
             }
         ]
-    }
+    })
     
-    spec = SoundSpec.model_validate(spec_dict)
+    monkeypatch.setattr(renderer, "LAYER_WORKERS", 1)
+    sequential = render_samples(spec)
     
-    samples1 = render_samples(spec)
-    samples2 = render_samples(spec)
+    # A pool owned by the test, so no executor outlives it
+    with ThreadPoolExecutor(max_workers=3) as pool:
+        monkeypatch.setattr(renderer, "LAYER_WORKERS", 3)
+        monkeypatch.setattr(renderer, "_layer_pool", lambda: pool)
+        concurrent = render_samples(spec)
     
-    assert samples1 == samples2
+    assert np.array_equal(sequential, concurrent)
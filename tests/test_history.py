@@ -0,0 +1,56 @@
+"""Tests for the persistent history store."""
+
+from soundforge.history import HistoryEntry, HistoryStore
+from soundforge.presets import get_default_pickup, get_ui_click
+
+
+def test_recent_is_newest_first(tmp_path):
+    """Test that recent specs come back newest first."""
+    store = HistoryStore(tmp_path / "history")
+    store.add(get_default_pickup())
+    store.add(get_ui_click())
+
+    assert [entry.name for entry in store.recent()] == ["ui_click", "gentle_pickup"]
+
+
+def test_history_persists(tmp_path):
+    """Test that history survives reopening the store."""
+    store = HistoryStore(tmp_path / "history")
+    store.add(get_default_pickup())
+    store.close()
+
+    reopened = HistoryStore(tmp_path / "history")
+    assert [entry.load() for entry in reopened.recent()] == [get_default_pickup()]
+
+
+def test_history_is_capped(tmp_path):
+    """Test that the oldest entries are dropped beyond max_entries."""
+    store = HistoryStore(tmp_path / "history", max_entries=3)
+    for seed in range(5):
+        spec = get_default_pickup()
+        spec.seed = seed
+        store.add(spec)
+
+    assert len(store) == 3
+    assert [entry.load().seed for entry in store.recent()] == [4, 3, 2]
+
+
+def test_memory_store():
+    """Test that a store without a path keeps history in memory."""
+    store = HistoryStore(max_entries=1)
+    store.add(get_default_pickup())
+    store.add(get_ui_click())
+
+    assert [entry.name for entry in store.recent()] == ["ui_click"]
+    assert [entry.name for entry in HistoryStore().recent()] == []
+
+
+def test_entry_round_trip():
+    """Test that entries summarize and restore the spec."""
+    spec = get_default_pickup()
+    entry = HistoryEntry.from_spec(spec)
+
+    assert (entry.name, entry.duration, entry.num_layers) == (spec.name, spec.duration, len(spec.layers))
+    assert len(entry.blob) < len(spec.model_dump_json(by_alias=True))
+    assert entry.load() == spec
+    assert entry.load() is not entry.load()
@@ -0,0 +1,293 @@
+"""Tests for LLM SoundSpec generation."""
+
+import sys
+import json
+import types
+import threading
+import pytest
+from soundforge import llm
+from soundforge.presets import get_default_pickup
+
+
+class FakeStream:
+    """Chunk iterator that records how far it was read and whether it was closed."""
+
+    def __init__(self, chunks):
+        self.chunks = chunks
+        self.read = 0
+        self.closed = False
+
+    def __iter__(self):
+        for chunk in self.chunks:
+            if self.closed:
+                return
+            self.read += 1
+            yield chunk
+
+    def close(self):
+        self.closed = True
+
+
+class FakeCompletions:
+    """Records requests and streams a fixed SoundSpec JSON response."""
+
+    def __init__(self, content: str):
+        self.content = content
+        self.calls = []
+        self.streams = []
+        self.reject_schema = False
+
+    def create(self, **kwargs):
+        self.calls.append(kwargs)
+        if self.reject_schema and kwargs["response_format"]["type"] == "json_schema":
+            error = Exception("response_format json_schema is not supported")
+            error.status_code = 400
+            raise error
+        pieces = [self.content[i:i + 64] for i in range(0, len(self.content), 64)]
+        stream = FakeStream([
+            types.SimpleNamespace(
+                choices=[
+                    types.SimpleNamespace(index=index, delta=types.SimpleNamespace(content=piece))
+                    for index in range(kwargs.get("n", 1))
+                ],
+                usage=None,
+            )
+            for piece in pieces
+        ])
+        self.streams.append(stream)
+        return stream
+
+
+@pytest.fixture(autouse=True)
+def no_dotenv(monkeypatch):
+    """Keep a developer's .env from supplying a real API key."""
+    monkeypatch.setattr(llm, "_load_dotenv", lambda: None)
+
+
+@pytest.fixture
+def fake_openai(monkeypatch, tmp_path):
+    """Install a fake openai module and clear the generation caches."""
+    spec_json = get_default_pickup().model_dump_json(by_alias=True)
+    completions = FakeCompletions(spec_json)
+
+    class FakeOpenAI:
+        def __init__(self, **kwargs):
+            self.chat = types.SimpleNamespace(completions=completions)
+
+    fake_module = types.SimpleNamespace(OpenAI=FakeOpenAI)
+    monkeypatch.setitem(sys.modules, "openai", fake_module)
+    monkeypatch.setattr(llm, "_strict_schema_supported", True)
+    monkeypatch.setenv("OPENAI_API_KEY", "sk-test")
+    monkeypatch.setenv("SOUNDFORGE_CACHE_DIR", str(tmp_path))
+    _clear_caches()
+    yield completions
+    _clear_caches()
+
+
+def _clear_caches():
+    """Drop the in-process caches, as on a fresh start."""
+    llm._get_client.cache_clear()
+    llm._get_exact_cache.cache_clear()
+    llm._get_semantic_cache.cache_clear()
+
+
+def test_mock_generator_without_api_key(monkeypatch):
+    """Test that the mock generator is used when no API key is set."""
+    monkeypatch.delenv("OPENAI_API_KEY", raising=False)
+    spec = llm.generate_soundspec("laser blast")
+    assert spec.name == "laser_blast"
+
+
+@pytest.mark.parametrize("prompt,name", [
+    ("Big BOOM", "explosion"),
+    ("shield deflection", "shield_deflect"),
+    ("boom then a laser", "laser_blast"),
+    ("coin pickup", "gentle_pickup"),
+])
+def test_mock_generator_keywords(prompt, name):
+    """Test that the mock generator picks presets by keyword priority."""
+    assert llm._mock_generator(prompt, None).name == name
+
+
+def test_classify_finds_keywords_in_one_pass():
+    """Test keyword matching, including substrings and multi-word phrases."""
+    assert llm._classify("Two LASERS and a Pure Tone") == {"laser", "pure tone"}
+    assert llm._classify("kaboom") == {"boom"}
+    assert llm._classify("soft hum") == frozenset()
+
+
+def test_generation_uses_cached_system_prompt(fake_openai):
+    """Test that the system prompt is static and style goes in the user message."""
+    llm.generate_soundspec("sparkly pickup", "pickup")
+
+    request = fake_openai.calls[0]
+    assert request["messages"][0] == {"role": "system", "content": llm.SYSTEM_PROMPT}
+    assert request["messages"][1]["content"] == "Style: pickup\nsparkly pickup"
+    assert request["extra_body"] == {"prompt_cache_key": llm.PROMPT_CACHE_KEY}
+    assert request["response_format"]["json_schema"]["strict"] is True
+
+
+def test_messages_keep_static_prefix():
+    """Test that only the user message varies between requests."""
+    laser = llm._build_messages(llm.SYSTEM_PROMPT, "laser", "zap")
+    plain = llm._build_messages(llm.SYSTEM_PROMPT, None, "soft chime")
+
+    assert laser[0] == plain[0]
+    assert laser[0]["content"] is llm.SYSTEM_PROMPT
+    assert plain[1]["content"] == "soft chime"
+    assert llm.PROMPT_CACHE_KEY.startswith("soundforge-")
+
+
+def test_response_schema_is_strict():
+    """Test that every object in the response schema is closed and fully required."""
+    def check(node):
+        if isinstance(node, dict):
+            assert "default" not in node
+            if "properties" in node:
+                assert node["additionalProperties"] is False
+                assert node["required"] == list(node["properties"])
+                node = node["properties"]
+            for value in node.values():
+                check(value)
+        elif isinstance(node, list):
+            for value in node:
+                check(value)
+
+    check(llm._response_schema())
+
+
+def test_rejected_schema_falls_back_to_json_object(fake_openai):
+    """Test that a strict schema rejection retries once in json_object mode."""
+    fake_openai.reject_schema = True
+    spec = llm.generate_soundspec("sparkly pickup")
+    assert spec.name == "gentle_pickup"
+    assert fake_openai.calls[1]["response_format"] == {"type": "json_object"}
+    assert fake_openai.calls[1]["messages"][0]["content"] == llm.JSON_MODE_SYSTEM_PROMPT
+
+    llm.generate_soundspec("deep rumble")
+    assert len(fake_openai.calls) == 3
+
+
+def test_identical_prompts_are_cached(fake_openai):
+    """Test that repeated prompts skip the API call."""
+    spec1 = llm.generate_soundspec("Sparkly pickup ", "pickup")
+    spec2 = llm.generate_soundspec("sparkly pickup", "pickup")
+
+    assert len(fake_openai.calls) == 1
+    # Normalization only applies to the cache key, not the text sent
+    assert fake_openai.calls[0]["messages"][1]["content"] == "Style: pickup\nSparkly pickup "
+    assert spec1 == spec2
+    # Each call returns an independent object that is safe to mutate
+    assert spec1 is not spec2
+    spec1.layers[0].amp = 0.1
+    assert spec2.layers[0].amp != 0.1
+
+
+def test_exact_cache_persists_across_restarts(fake_openai, monkeypatch):
+    """Test that the on-disk exact cache serves prompts after a restart."""
+    # Disable the semantic tier so only the exact tier can hit
+    monkeypatch.setenv("SOUNDFORGE_SEMANTIC_THRESHOLD", "2.0")
+    llm.generate_soundspec("sparkly pickup", "pickup")
+    _clear_caches()
+    llm.generate_soundspec(" Sparkly pickup", "pickup")
+
+    assert len(fake_openai.calls) == 1
+
+
+def test_rephrased_prompts_hit_semantic_cache(fake_openai):
+    """Test that reordered wording reuses the cached spec."""
+    llm.generate_soundspec("sparkly diamond pickup", "pickup")
+    llm.generate_soundspec("pickup, diamond sparkly", "pickup")
+
+    assert len(fake_openai.calls) == 1
+
+
+def test_style_is_part_of_cache_key(fake_openai):
+    """Test that a different style triggers a new request."""
+    llm.generate_soundspec("sparkly pickup", "pickup")
+    llm.generate_soundspec("sparkly pickup", "ui")
+
+    assert len(fake_openai.calls) == 2
+
+
+def test_failed_generation_falls_back_and_is_not_cached(fake_openai):
+    """Test that invalid responses fall back to the mock and are retried."""
+    fake_openai.content = json.dumps({"version": "soundspec-2"})
+    spec = llm.generate_soundspec("laser blast")
+    assert spec.name == "laser_blast"
+
+    llm.generate_soundspec("laser blast")
+    assert len(fake_openai.calls) == 2
+
+
+def test_wrong_version_aborts_stream(fake_openai):
+    """Test that an unsupported version stops reading the response early."""
+    fake_openai.content = '{"version": "soundspec-2", ' + '"padding": "xxxxxxxx", ' * 50 + '}'
+    spec = llm.generate_soundspec("laser blast")
+
+    assert spec.name == "laser_blast"
+    stream = fake_openai.streams[0]
+    assert stream.closed
+    assert stream.read < len(stream.chunks)
+
+
+def test_batch_uses_single_request(fake_openai):
+    """Test that variations come from one request with n choices."""
+    specs = llm.generate_soundspec_batch("sparkly pickup", n=3)
+
+    assert len(fake_openai.calls) == 1
+    assert fake_openai.calls[0]["n"] == 3
+    assert len(specs) == 3
+    assert len({id(spec) for spec in specs}) == 3
+
+
+def test_many_prompts_run_concurrently(fake_openai, monkeypatch):
+    """Test that distinct prompts are requested once each, in parallel."""
+    monkeypatch.setenv("SOUNDFORGE_SEMANTIC_THRESHOLD", "2.0")
+    barrier = threading.Barrier(3, timeout=5)
+    create = fake_openai.create
+
+    def create_together(**kwargs):
+        # Only returns if all three requests are in flight at once
+        barrier.wait()
+        return create(**kwargs)
+
+    fake_openai.create = create_together
+    specs = llm.generate_soundspec_many(["zap", "boom", "chime", "Zap "])
+
+    assert len(fake_openai.calls) == 3
+    assert len(specs) == 4
+    assert specs[0] == specs[3]
+    assert specs[0] is not specs[3]
+
+
+def test_mock_batch_varies_seed(monkeypatch):
+    """Test that mock variations are distinct specs."""
+    monkeypatch.delenv("OPENAI_API_KEY", raising=False)
+    specs = llm.generate_soundspec_batch("explosion", n=4)
+
+    assert [spec.name for spec in specs] == [f"explosion_{i}" for i in range(1, 5)]
+    assert len({spec.seed for spec in specs}) == 4
+
+
+def test_enrichment_adds_layer_in_place():
+    """Test that single-layer specs get a keyword-matched companion layer."""
+    spec = get_default_pickup()
+    spec.layers = spec.layers[:1]
+    enriched = llm._ensure_rich_layers(spec, "laser zap")
+
+    assert enriched is spec
+    assert [layer.type for layer in spec.layers][-1] == "chirp"
+    assert spec.params[-1].path == f"layers_by_id.{spec.layers[-1].id}.chirp.f_start"
+
+
+def test_enrichment_respects_param_limit():
+    """Test that enrichment skips the extra param when the spec is full."""
+    spec = get_default_pickup()
+    spec.layers = spec.layers[:1]
+    param = spec.params[0]
+    spec.params = [param.model_copy(update={"id": f"p{i}"}) for i in range(24)]
+    llm._ensure_rich_layers(spec, "coin pickup")
+
+    assert len(spec.layers) == 2
+    assert len(spec.params) == 24
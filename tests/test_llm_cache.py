@@ -0,0 +1,29 @@
+"""Tests for the exact-match LLM cache."""
+
+from soundforge.llm_cache import ExactCache, prompt_key
+
+
+def test_prompt_key_covers_all_inputs():
+    """Test that the system prompt, style and prompt all change the key."""
+    key = prompt_key("system", "laser", "zap")
+    assert key == prompt_key("system", "laser", "zap")
+    assert key != prompt_key("system v2", "laser", "zap")
+    assert key != prompt_key("system", "ui", "zap")
+    assert key != prompt_key("system", "laser", "zap zap")
+    assert prompt_key("system", None, "zap") == prompt_key("system", "", "zap")
+
+
+def test_memory_cache():
+    """Test get/put without a database."""
+    cache = ExactCache()
+    assert cache.get("key") is None
+
+    cache.put("key", '{"name": "zap"}')
+    assert cache.get("key") == '{"name": "zap"}'
+
+
+def test_cache_persists(tmp_path):
+    """Test that entries survive reopening the database."""
+    ExactCache(tmp_path / "specs.sqlite3").put("key", '{"name": "zap"}')
+
+    assert ExactCache(tmp_path / "specs.sqlite3").get("key") == '{"name": "zap"}'
@@ -1,56 +1,62 @@
 """Tests for parameter path updates."""
 
+import numpy as np
 import pytest
 from soundforge.schema import SoundSpec
 from soundforge.paths import update_spec_from_param
+from soundforge.renderer import render_samples
+
+
+# A spec with various layer types
+SPEC_DICT = {
+    "version": "soundspec-1",
+    "name": "test",
+    "description": "test",
+    "sample_rate": 44100,
+    "duration": 0.5,
+    "seed": 42,
+    "global": {"amp": 0.8, "normalize": False},
+    "layers": [
+        {
+            "id": "main",
+            "type": "osc",
+            "amp": 0.7,
+            "pan": 0.0,
+            "phase": 0.0,
+            "env": {"attack": 0.01, "decay": 0.3, "shape": "exp"},
+            "osc": {"waveform": "sine", "freq": 440.0, "detune": 0.0}
+        },
+        {
+            "id": "chirp",
+            "type": "chirp",
+            "amp": 0.6,
+            "pan": 0.0,
+            "phase": 0.0,
+            "env": {"attack": 0.01, "decay": 0.2, "shape": "exp"},
+            "chirp": {
+                "waveform": "saw",
+                "f_start": 1000.0,
+                "f_end": 200.0,
+                "curve": "exponential",
+                "vibrato_hz": 0.0,
+                "vibrato_depth": 0.0
+            }
+        }
+    ],
+    "fx_chain": [
+        {
+            "type": "softclip",
+            "enabled": True,
+            "params": {"drive": 2.0}
+        }
+    ]
+}
 
 
 def get_test_spec() -> SoundSpec:
-    """Get a test spec with various layer types."""
-    spec_dict = {
-        "version": "soundspec-1",
-        "name": "test",
-        "description": "test",
-        "sample_rate": 44100,
-        "duration": 0.5,
-        "seed": 42,
-        "global": {"amp": 0.8, "normalize": False},
-        "layers": [
-            {
-                "id": "main",
-                "type": "osc",
-                "amp": 0.7,
-                "pan": 0.0,
-                "phase": 0.0,
-                "env": {"attack": 0.01, "decay": 0.3, "shape": "exp"},
-                "osc": {"waveform": "sine", "freq": 440.0, "detune": 0.0}
-            },
-            {
-                "id": "chirp",
-                "type": "chirp",
-                "amp": 0.6,
-                "pan": 0.0,
-                "phase": 0.0,
-                "env": {"attack": 0.01, "decay": 0.2, "shape": "exp"},
-                "chirp": {
-                    "waveform": "saw",
-                    "f_start": 1000.0,
-                    "f_end": 200.0,
-                    "curve": "exponential",
-                    "vibrato_hz": 0.0,
-                    "vibrato_depth": 0.0
-                }
-            }
-        ],
-        "fx_chain": [
-            {
-                "type": "softclip",
-                "enabled": True,
-                "params": {"drive": 2.0}
-            }
-        ]
-    }
-    return SoundSpec.model_validate(spec_dict)
+    """Get a fresh, independently mutable test spec."""
+    # Validating the dict is cheaper than deep-copying a shared SoundSpec
+    return SoundSpec.model_validate(SPEC_DICT)
 
 
 def test_update_global_amp():
@@ -113,6 +119,21 @@ def test_update_osc_freq():
     assert spec.layers[0].osc.freq == 880.0
 
 
+def test_repeated_path_updates_each_spec():
+    """Test that a path used again applies to the spec it is given."""
+    spec1 = get_test_spec()
+    spec2 = get_test_spec()
+    
+    assert update_spec_from_param(spec1, "layers_by_id.main.osc.freq", 880.0)
+    assert update_spec_from_param(spec2, "layers_by_id.main.osc.freq", 220.0)
+    assert spec1.layers[0].osc.freq == 880.0
+    assert spec2.layers[0].osc.freq == 220.0
+    
+    # A missing layer still fails once the path is known
+    spec2.layers.pop(0)
+    assert not update_spec_from_param(spec2, "layers_by_id.main.osc.freq", 440.0)
+
+
 def test_update_chirp_params():
     """Test updating chirp parameters."""
     spec = get_test_spec()
@@ -185,6 +206,37 @@ def test_invalid_path():
     assert not success
 
 
+def test_layer_index_tracks_layer_changes():
+    """Test that layers_by_id sees appended and replaced layers."""
+    spec = get_test_spec()
+    assert update_spec_from_param(spec, "layers_by_id.main.amp", 0.5)
+    
+    extra = spec.layers[0].model_copy(update={"id": "extra"})
+    spec.layers.append(extra)
+    assert update_spec_from_param(spec, "layers_by_id.extra.amp", 0.2)
+    assert extra.amp == 0.2
+    
+    spec.layers = [extra]
+    assert not update_spec_from_param(spec, "layers_by_id.main.amp", 0.5)
+
+
+def test_update_bumps_revision():
+    """Test that only successful updates bump the spec revision."""
+    spec = get_test_spec()
+    assert spec.revision == 0
+    
+    assert update_spec_from_param(spec, "global.amp", 0.5)
+    assert spec.revision == 1
+    
+    assert not update_spec_from_param(spec, "invalid.path", 1.0)
+    assert spec.revision == 1
+    
+    # The counter is bookkeeping, not part of the spec's value
+    other = get_test_spec()
+    other.global_.amp = 0.5
+    assert spec == other
+
+
 def test_update_layer_pan():
     """Test updating layer pan."""
     spec = get_test_spec()
@@ -244,3 +296,20 @@ def test_update_with_modulation():
     success = update_spec_from_param(spec, "layers_by_id.main.mod.tremolo_depth", 0.5)
     assert success
     assert spec.layers[0].mod.tremolo_depth == 0.5
+
+
+def test_zero_delay_time_renders_dry():
+    """Test that a delay slider pushed to 0 ms renders without echoes."""
+    spec_dict = {**SPEC_DICT, "duration": 0.1}
+    spec_dict["fx_chain"] = [
+        {"type": "delay", "enabled": True, "params": {"time_ms": 50.0, "feedback": 0.5, "mix": 0.5}}
+    ]
+    spec = SoundSpec.model_validate(spec_dict)
+    
+    # Assignments are not validated, so the schema's 5 ms minimum is bypassed
+    assert update_spec_from_param(spec, "fx_by_type.delay.params.time_ms", 0.0)
+    samples = render_samples(spec)
+    
+    spec.fx_chain[0].enabled = False
+    assert np.all(np.isfinite(samples))
+    assert np.array_equal(samples, render_samples(spec))
@@ -0,0 +1,101 @@
+"""Tests for the semantic prompt cache."""
+
+import numpy as np
+import pytest
+from soundforge.semantic_cache import SemanticCache, embed_text, stem_word, EMBEDDING_DIM
+
+
+def test_embedding_is_unit_length():
+    """Test that embeddings are normalized for cosine scoring."""
+    vec = embed_text("laser zap")
+    assert vec.shape == (EMBEDDING_DIM,)
+    assert vec.dtype == np.float32
+    assert abs(float(np.linalg.norm(vec)) - 1.0) < 1e-6
+
+
+def test_similar_prompt_hits():
+    """Test that a reworded prompt returns the cached spec."""
+    cache = SemanticCache()
+    cache.add("laser zap", "laser", '{"name": "zap"}')
+
+    assert cache.lookup("Zap laser!", "laser") == '{"name": "zap"}'
+
+
+@pytest.mark.parametrize("cached,prompt", [
+    ("laser zap", "zappy laser"),
+    ("laser", "lasers"),
+    ("laser zap", "a laser zap sound effect"),
+    ("explosion boom", "booming explosions"),
+    ("shield deflect", "deflecting shield"),
+    ("magic chime", "magical chimes"),
+])
+def test_inflected_rewording_hits(cached, prompt):
+    """Test that other forms of the same words reuse the cached spec."""
+    cache = SemanticCache()
+    cache.add(cached, None, '{"name": "hit"}')
+
+    assert cache.lookup(prompt) == '{"name": "hit"}'
+
+
+@pytest.mark.parametrize("cached,prompt", [
+    ("laser zap", "laser boom"),
+    ("big explosion", "small explosion"),
+    ("shield deflect", "shield break"),
+    ("retro laser", "laser"),
+    # Antonyms in otherwise identical prompts ask for the opposite sound
+    ("short punchy retro laser zap with metallic ring", "long punchy retro laser zap with metallic ring"),
+    ("high pitched bright coin pickup chime", "low pitched bright coin pickup chime"),
+    ("heavy wooden door slowly opening with creak", "heavy wooden door slowly closing with creak"),
+])
+def test_shared_word_alone_misses(cached, prompt):
+    """Test that prompts differing in any content word are not matched."""
+    cache = SemanticCache()
+    cache.add(cached, None, '{"name": "hit"}')
+
+    assert cache.lookup(prompt) is None
+
+
+def test_stem_word():
+    """Test that inflections reduce to a shared stem."""
+    assert stem_word("zappy") == stem_word("zaps") == stem_word("zapping") == "zap"
+    assert stem_word("chimes") == stem_word("chime")
+    assert stem_word("magical") == "magic"
+
+
+def test_different_prompt_misses():
+    """Test that an unrelated prompt is not matched."""
+    cache = SemanticCache()
+    cache.add("laser zap", "laser", '{"name": "zap"}')
+
+    assert cache.lookup("deep explosion rumble", "laser") is None
+
+
+def test_style_is_a_hard_filter():
+    """Test that entries are never shared across styles."""
+    cache = SemanticCache()
+    cache.add("laser zap", "laser", '{"name": "zap"}')
+
+    assert cache.lookup("laser zap", None) is None
+    assert cache.lookup("laser zap", "ui") is None
+
+
+def test_max_entries_evicts_oldest():
+    """Test that the cache is bounded."""
+    cache = SemanticCache(max_entries=2)
+    cache.add("laser zap", None, "1")
+    cache.add("explosion boom", None, "2")
+    cache.add("shield deflect", None, "3")
+
+    assert len(cache) == 2
+    assert cache.lookup("laser zap") is None
+    assert cache.lookup("shield deflect") == "3"
+
+
+def test_persistence_roundtrip(tmp_path):
+    """Test that entries survive reloading from disk."""
+    cache = SemanticCache(path=tmp_path)
+    cache.add("laser zap", "laser", '{"name": "zap"}')
+
+    reloaded = SemanticCache(path=tmp_path)
+    assert len(reloaded) == 1
+    assert reloaded.lookup("zap laser", "laser") == '{"name": "zap"}'
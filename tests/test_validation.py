@@ -2,38 +2,170 @@
 
 import pytest
 from pydantic import ValidationError
-from soundforge.schema import SoundSpec, Layer, LayerType, Envelope, OscParams, Waveform
+from soundforge.schema import SoundSpec, Layer, LayerType, Envelope, OscParams, Waveform, export_json_schema
 
 
-def test_valid_soundspec():
-    """Test that a valid SoundSpec validates correctly."""
-    spec_dict = {
-        "version": "soundspec-1",
-        "name": "test_sound",
-        "description": "A test sound",
-        "sample_rate": 44100,
-        "duration": 0.5,
-        "seed": 42,
-        "global": {"amp": 0.8, "normalize": True},
-        "layers": [
-            {
-                "id": "main",
-                "type": "osc",
-                "amp": 0.7,
-                "pan": 0.0,
-                "phase": 0.0,
-                "env": {"attack": 0.01, "decay": 0.3, "shape": "exp"},
-                "osc": {"waveform": "sine", "freq": 440.0, "detune": 0.0}
+VALID_SPEC = {
+    "version": "soundspec-1",
+    "name": "test_sound",
+    "description": "A test sound",
+    "sample_rate": 44100,
+    "duration": 0.5,
+    "seed": 42,
+    "global": {"amp": 0.8, "normalize": True},
+    "layers": [
+        {
+            "id": "main",
+            "type": "osc",
+            "amp": 0.7,
+            "pan": 0.0,
+            "phase": 0.0,
+            "env": {"attack": 0.01, "decay": 0.3, "shape": "exp"},
+            "osc": {"waveform": "sine", "freq": 440.0, "detune": 0.0}
+        }
+    ],
+    "fx_chain": [],
+    "params": []
+}
+
+CHIRP_SPEC = {
+    "version": "soundspec-1",
+    "name": "test",
+    "description": "test",
+    "sample_rate": 44100,
+    "duration": 0.5,
+    "seed": 42,
+    "global": {"amp": 0.8, "normalize": False},
+    "layers": [
+        {
+            "id": "laser",
+            "type": "chirp",
+            "amp": 0.8,
+            "pan": 0.0,
+            "phase": 0.0,
+            "env": {"attack": 0.01, "decay": 0.3, "shape": "exp"},
+            "chirp": {
+                "waveform": "saw",
+                "f_start": 1000.0,
+                "f_end": 200.0,
+                "curve": "exponential",
+                "vibrato_hz": 5.0,
+                "vibrato_depth": 0.05
             }
-        ],
-        "fx_chain": [],
-        "params": []
-    }
-    
-    spec = SoundSpec.model_validate(spec_dict)
-    assert spec.name == "test_sound"
-    assert spec.duration == 0.5
-    assert len(spec.layers) == 1
+        }
+    ]
+}
+
+FM_SPEC = {
+    "version": "soundspec-1",
+    "name": "test",
+    "description": "test",
+    "sample_rate": 44100,
+    "duration": 0.5,
+    "seed": 42,
+    "global": {"amp": 0.8, "normalize": False},
+    "layers": [
+        {
+            "id": "fm_tone",
+            "type": "fm",
+            "amp": 0.7,
+            "pan": 0.0,
+            "phase": 0.0,
+            "env": {"attack": 0.01, "decay": 0.3, "shape": "exp"},
+            "fm": {
+                "carrier_freq": 440.0,
+                "mod_freq": 220.0,
+                "index": 5.0,
+                "brightness": 0.5
+            }
+        }
+    ]
+}
+
+NOISE_SPEC = {
+    "version": "soundspec-1",
+    "name": "test",
+    "description": "test",
+    "sample_rate": 44100,
+    "duration": 0.5,
+    "seed": 42,
+    "global": {"amp": 0.8, "normalize": False},
+    "layers": [
+        {
+            "id": "noise",
+            "type": "noise",
+            "amp": 0.6,
+            "pan": 0.0,
+            "phase": 0.0,
+            "env": {"attack": 0.001, "decay": 0.2, "shape": "exp"},
+            "noise": {
+                "color": "white",
+                "cutoff_start": 5000.0,
+                "cutoff_end": 1000.0,
+                "cutoff_curve": "exponential"
+            }
+        }
+    ]
+}
+
+IMPULSE_SPEC = {
+    "version": "soundspec-1",
+    "name": "test",
+    "description": "test",
+    "sample_rate": 44100,
+    "duration": 0.5,
+    "seed": 42,
+    "global": {"amp": 0.8, "normalize": False},
+    "layers": [
+        {
+            "id": "click",
+            "type": "impulse",
+            "amp": 0.8,
+            "pan": 0.0,
+            "phase": 0.0,
+            "env": {"attack": 0.001, "decay": 0.05, "shape": "exp"},
+            "impulse": {
+                "kind": "metal_ping",
+                "width": 0.005,
+                "tone_freq": 2000.0
+            }
+        }
+    ]
+}
+
+
+# Valid specs are validated once per module; the rejection tests call
+# model_validate themselves since raising is what they check.
+@pytest.fixture(scope="module")
+def valid_spec():
+    return SoundSpec.model_validate(VALID_SPEC)
+
+
+@pytest.fixture(scope="module")
+def chirp_spec():
+    return SoundSpec.model_validate(CHIRP_SPEC)
+
+
+@pytest.fixture(scope="module")
+def fm_spec():
+    return SoundSpec.model_validate(FM_SPEC)
+
+
+@pytest.fixture(scope="module")
+def noise_spec():
+    return SoundSpec.model_validate(NOISE_SPEC)
+
+
+@pytest.fixture(scope="module")
+def impulse_spec():
+    return SoundSpec.model_validate(IMPULSE_SPEC)
+
+
+def test_valid_soundspec(valid_spec):
+    """Test that a valid SoundSpec validates correctly."""
+    assert valid_spec.name == "test_sound"
+    assert valid_spec.duration == 0.5
+    assert len(valid_spec.layers) == 1
 
 
 def test_invalid_version():
@@ -180,133 +312,33 @@ def test_frequency_bounds():
         SoundSpec.model_validate(spec_dict)
 
 
-def test_chirp_layer():
+def test_chirp_layer(chirp_spec):
     """Test chirp layer validation."""
-    spec_dict = {
-        "version": "soundspec-1",
-        "name": "test",
-        "description": "test",
-        "sample_rate": 44100,
-        "duration": 0.5,
-        "seed": 42,
-        "global": {"amp": 0.8, "normalize": False},
-        "layers": [
-            {
-                "id": "laser",
-                "type": "chirp",
-                "amp": 0.8,
-                "pan": 0.0,
-                "phase": 0.0,
-                "env": {"attack": 0.01, "decay": 0.3, "shape": "exp"},
-                "chirp": {
-                    "waveform": "saw",
-                    "f_start": 1000.0,
-                    "f_end": 200.0,
-                    "curve": "exponential",
-                    "vibrato_hz": 5.0,
-                    "vibrato_depth": 0.05
-                }
-            }
-        ]
-    }
-    
-    spec = SoundSpec.model_validate(spec_dict)
-    assert spec.layers[0].chirp.f_start == 1000.0
-    assert spec.layers[0].chirp.curve.value == "exponential"
+    assert chirp_spec.layers[0].chirp.f_start == 1000.0
+    assert chirp_spec.layers[0].chirp.curve.value == "exponential"
 
 
-def test_fm_layer():
+def test_fm_layer(fm_spec):
     """Test FM layer validation."""
-    spec_dict = {
-        "version": "soundspec-1",
-        "name": "test",
-        "description": "test",
-        "sample_rate": 44100,
-        "duration": 0.5,
-        "seed": 42,
-        "global": {"amp": 0.8, "normalize": False},
-        "layers": [
-            {
-                "id": "fm_tone",
-                "type": "fm",
-                "amp": 0.7,
-                "pan": 0.0,
-                "phase": 0.0,
-                "env": {"attack": 0.01, "decay": 0.3, "shape": "exp"},
-                "fm": {
-                    "carrier_freq": 440.0,
-                    "mod_freq": 220.0,
-                    "index": 5.0,
-                    "brightness": 0.5
-                }
-            }
-        ]
-    }
-    
-    spec = SoundSpec.model_validate(spec_dict)
-    assert spec.layers[0].fm.carrier_freq == 440.0
-    assert spec.layers[0].fm.index == 5.0
+    assert fm_spec.layers[0].fm.carrier_freq == 440.0
+    assert fm_spec.layers[0].fm.index == 5.0
 
 
-def test_noise_layer():
+def test_noise_layer(noise_spec):
     """Test noise layer validation."""
-    spec_dict = {
-        "version": "soundspec-1",
-        "name": "test",
-        "description": "test",
-        "sample_rate": 44100,
-        "duration": 0.5,
-        "seed": 42,
-        "global": {"amp": 0.8, "normalize": False},
-        "layers": [
-            {
-                "id": "noise",
-                "type": "noise",
-                "amp": 0.6,
-                "pan": 0.0,
-                "phase": 0.0,
-                "env": {"attack": 0.001, "decay": 0.2, "shape": "exp"},
-                "noise": {
-                    "color": "white",
-                    "cutoff_start": 5000.0,
-                    "cutoff_end": 1000.0,
-                    "cutoff_curve": "exponential"
-                }
-            }
-        ]
-    }
-    
-    spec = SoundSpec.model_validate(spec_dict)
-    assert spec.layers[0].noise.color.value == "white"
+    assert noise_spec.layers[0].noise.color.value == "white"
 
 
-def test_impulse_layer():
+def test_impulse_layer(impulse_spec):
     """Test impulse layer validation."""
-    spec_dict = {
-        "version": "soundspec-1",
-        "name": "test",
-        "description": "test",
-        "sample_rate": 44100,
-        "duration": 0.5,
-        "seed": 42,
-        "global": {"amp": 0.8, "normalize": False},
-        "layers": [
-            {
-                "id": "click",
-                "type": "impulse",
-                "amp": 0.8,
-                "pan": 0.0,
-                "phase": 0.0,
-                "env": {"attack": 0.001, "decay": 0.05, "shape": "exp"},
-                "impulse": {
-                    "kind": "metal_ping",
-                    "width": 0.005,
-                    "tone_freq": 2000.0
-                }
-            }
-        ]
-    }
+    assert impulse_spec.layers[0].impulse.kind.value == "metal_ping"
+    assert impulse_spec.layers[0].impulse.tone_freq == 2000.0
+
+
+def test_exported_schema_is_a_fresh_copy():
+    """Test that callers can modify the exported schema without affecting others."""
+    schema = export_json_schema()
+    assert schema == SoundSpec.model_json_schema()
     
-    spec = SoundSpec.model_validate(spec_dict)
-    assert spec.layers[0].impulse.kind.value == "metal_ping"
-    assert spec.layers[0].impulse.tone_freq == 2000.0
+    schema["properties"].clear()
+    assert export_json_schema()["properties"]